@@ -0,0 +1,81 @@
+"""
+Benchmark chained image transforms: step-by-step resampling vs AffinePipeline
+
+Applies rotate -> scale -> shear -> translate to batches of images, once
+resampling after every step (like ImageTransformer in project 1.2) and once
+with the steps fused into one matrix. Also reports the interpolation error
+each approach accumulates on a rotate(+30) -> rotate(-30) round trip.
+
+Usage:
+    python benchmarks/bench_affine_pipeline.py [n_images]
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils.image_transforms import AffinePipeline, warp_affine
+
+
+def make_images(n: int, size: int) -> np.ndarray:
+    """Smooth random images (sums of Gaussian blobs) so interpolation error is meaningful."""
+    rng = np.random.default_rng(0)
+    ys, xs = np.mgrid[0:size, 0:size]
+    images = np.zeros((n, size, size))
+    for _ in range(5):
+        cx, cy = rng.uniform(0.2, 0.8, (2, n, 1, 1)) * size
+        images += np.exp(-((xs - cx) ** 2 + (ys - cy) ** 2) / (2 * (size / 8) ** 2))
+    return images / images.max(axis=(1, 2), keepdims=True)
+
+
+def chain(images: np.ndarray) -> AffinePipeline:
+    return AffinePipeline(images, batch=True).rotate(30).scale(1.2).shear(0.2).translate(3, -2)
+
+
+def stepwise(pipeline: AffinePipeline) -> np.ndarray:
+    """Resample after every step, as chained single transforms do."""
+    images = pipeline.original
+    for matrix, output_shape in pipeline.steps:
+        images = warp_affine(images, matrix, output_shape, batch=True)
+    return images
+
+
+def fused(pipeline: AffinePipeline) -> np.ndarray:
+    pipeline._result = None
+    return pipeline.result
+
+
+def bench(label: str, func, number: int = 3):
+    seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+    print(f"  {label:<40} {seconds * 1000:8.1f} ms")
+    return seconds
+
+
+def main():
+    n_images = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    
+    for n, size in ((n_images, 28), (max(1, n_images // 50), 200)):
+        images = make_images(n, size)
+        pipeline = chain(images)
+        print(f"\n{n} images of {size}x{size}, {len(pipeline.steps)} steps")
+        
+        slow = bench("step-by-step (resample per step)", lambda: stepwise(pipeline))
+        fast = bench("AffinePipeline (one resample)", lambda: fused(pipeline))
+        print(f"  {'speedup':<40} {slow / fast:8.1f}x")
+        
+        # Includes corners the intermediate canvases cropped away
+        print(f"  {'mean |step-by-step - fused|':<40} {np.abs(stepwise(pipeline) - fused(pipeline)).mean():8.4f}")
+        
+        # Rotating there and back is the identity; compare away from the corners
+        round_trip = AffinePipeline(images, batch=True).rotate(30).rotate(-30)
+        inner = (slice(None), slice(size // 4, 3 * size // 4), slice(size // 4, 3 * size // 4))
+        step_error = np.abs(stepwise(round_trip) - images)[inner].mean()
+        fused_error = np.abs(round_trip.result - images)[inner].mean()
+        print(f"  {'round-trip error step-by-step / fused':<40} {step_error:.4f} / {fused_error:.4f}")
+
+
+if __name__ == "__main__":
+    main()
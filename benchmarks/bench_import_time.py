@@ -0,0 +1,75 @@
+"""
+Benchmark the import cost of the utils package
+
+Runs each import in a fresh interpreter with ``python -X importtime`` and
+reports how long the statement took and which heavy libraries (plotting,
+notebook export, data frames) it pulled in.
+
+Usage:
+    python benchmarks/bench_import_time.py [repeats]
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+STATEMENTS = [
+    "from utils import get_tracker",
+    "from utils import TrackerService",
+    "from utils import setup_figure",
+    "from utils import *",
+]
+
+HEAVY_MODULES = ["numpy", "pandas", "matplotlib", "seaborn", "nbformat", "nbconvert", "sklearn"]
+
+
+def import_profile(statement: str):
+    """
+    Time an import in a fresh interpreter and parse the -X importtime report.
+    
+    The statement is timed with perf_counter inside the child process: names
+    that utils loads lazily are imported through importlib, which -X importtime
+    does not report as a line of its own.
+    
+    Args:
+        statement: Import statement to run
+        
+    Returns:
+        Tuple of (seconds spent in the statement, set of top-level modules imported)
+    """
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    
+    modules = set()
+    for line in result.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if line.startswith("import time:") and "[us]" not in line:
+            modules.add(line.rsplit("|", 1)[1].strip().split(".")[0])
+    return float(result.stdout.strip().splitlines()[-1]), modules
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    
+    print(f"{'statement':<34} {'import':>10}  heavy modules loaded")
+    for statement in STATEMENTS:
+        try:
+            runs = [import_profile(statement) for _ in range(repeats)]
+        except RuntimeError as e:
+            print(f"{statement:<34} {'failed':>10}  {e}")
+            continue
+        best = min(seconds for seconds, _ in runs)
+        heavy = [m for m in HEAVY_MODULES if m in runs[0][1]]
+        print(f"{statement:<34} {best * 1000:7.1f} ms  {', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
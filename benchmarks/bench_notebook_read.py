@@ -0,0 +1,77 @@
+"""
+Benchmark notebook loading: nbformat.read vs NotebookReader
+
+Builds a synthetic notebook with many embedded image outputs and times
+the regular path against the fast reader (cold and cached validation,
+with and without outputs).
+
+Usage:
+    python benchmarks/bench_notebook_read.py [n_cells]
+"""
+
+import base64
+import os
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+import nbformat
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils.notebook_reader import NotebookReader
+
+
+def make_notebook(path: Path, n_cells: int):
+    """Write a notebook with a PNG-sized output and a text output per cell."""
+    png = base64.b64encode(os.urandom(30_000)).decode('ascii')
+    nb = nbformat.v4.new_notebook()
+    for i in range(n_cells):
+        nb.cells.append(nbformat.v4.new_markdown_cell(f"## Step {i}"))
+        nb.cells.append(nbformat.v4.new_code_cell(
+            source=f"plt.plot(x, x ** {i})",
+            execution_count=i + 1,
+            outputs=[
+                nbformat.v4.new_output("stream", name="stdout", text=f"step {i}\n" * 20),
+                nbformat.v4.new_output("display_data", data={"image/png": png, "text/plain": "<Figure>"}),
+            ]
+        ))
+    nbformat.write(nb, str(path))
+
+
+def bench(label: str, func, number: int = 5):
+    seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+    print(f"  {label:<40} {seconds * 1000:8.1f} ms")
+    return seconds
+
+
+def main():
+    n_cells = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "large.ipynb"
+        make_notebook(path, n_cells)
+        size_mb = path.stat().st_size / 1e6
+        print(f"Notebook: {n_cells * 2} cells, {size_mb:.1f} MB")
+
+        def regular():
+            with open(path, 'r', encoding='utf-8') as f:
+                nbformat.read(f, as_version=4)
+
+        def cold():
+            NotebookReader().read(path)
+
+        warm_reader = NotebookReader()
+        warm_reader.read(path)
+        warm_reader.read(path, outputs=False)
+
+        base = bench("nbformat.read", regular)
+        bench("NotebookReader (cold validation)", cold)
+        fast = bench("NotebookReader (cached validation)", lambda: warm_reader.read(path))
+        stripped = bench("NotebookReader (cached, no outputs)", lambda: warm_reader.read(path, outputs=False))
+
+        print(f"\nSpeedup: {base / fast:.1f}x with outputs, {base / stripped:.1f}x without")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark tracker file formats: pretty JSON vs compact, gzip and msgpack
+
+Builds a synthetic multi-year learning history (daily activity for every
+day, thousands of completed exercises) and times saving and loading it
+through JsonStorage with each serializer.
+
+Usage:
+    python benchmarks/bench_tracker_serialization.py [years]
+"""
+
+import random
+import sys
+import tempfile
+import timeit
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils.progress_serializers import SERIALIZERS
+from utils.progress_storage import JsonStorage
+from utils.progress_tracker import ProgressTracker
+
+
+def make_progress(years: int) -> dict:
+    """Progress dict with one daily_activity entry per day and ~5 exercises per day."""
+    rng = random.Random(0)
+    progress = ProgressTracker._new_progress()
+    start = date.today() - timedelta(days=365 * years)
+    modules = list(progress["modules"])
+    
+    for day in range(365 * years):
+        current = start + timedelta(days=day)
+        visited = rng.sample(modules, rng.randint(1, 3))
+        progress["daily_activity"][current.isoformat()] = {
+            "total_time_minutes": rng.uniform(10, 180),
+            "sessions": rng.randint(1, 4),
+            "modules_visited": visited,
+        }
+        for i in range(5):
+            module = rng.choice(modules)
+            progress["modules"][module]["exercises_completed"].append({
+                "id": f"ex_{day}_{i}",
+                "completed_at": f"{current.isoformat()}T{rng.randint(8, 22):02d}:00:00",
+                "score": round(rng.random(), 3),
+                "module": module,
+            })
+    return progress
+
+
+def bench(label: str, func, number: int = 5):
+    seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+    return seconds * 1000
+
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    progress = make_progress(years)
+    print(f"History: {years} years, {len(progress['daily_activity'])} days, "
+          f"{sum(len(m['exercises_completed']) for m in progress['modules'].values())} exercises\n")
+    print(f"  {'serializer':<10} {'size':>10} {'save':>10} {'load':>10}")
+    
+    for name in SERIALIZERS:
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                storage = JsonStorage(Path(tmp), serializer=name)
+            except ImportError as e:
+                print(f"  {name:<10} skipped ({e})")
+                continue
+            
+            save = bench("save", lambda: storage.save_progress(progress))
+            load = bench("load", storage.load_progress)
+            assert storage.load_progress() == progress
+            
+            size_kb = storage.progress_file.stat().st_size / 1024
+            print(f"  {name:<10} {size_kb:>8.0f}KB {save:>8.1f}ms {load:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
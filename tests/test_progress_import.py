@@ -0,0 +1,24 @@
+"""
+Tests for importing historical progress
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils.progress_tracker import ProgressTracker
+
+
+def test_blank_score_defaults_to_one(tmp_path):
+    tracker = ProgressTracker(tmp_path, serializer="compact")
+    tracker.import_history(exercises=[
+        {"module": "module_1", "exercise_id": "ex_1_1", "completed_at": "2024-03-01T10:00:00", "score": None},
+        {"module": "module_1", "exercise_id": "ex_1_2", "completed_at": "2024-03-02T10:00:00", "score": 0.5},
+    ])
+    tracker.close()
+    
+    # The saved file must load again (NaN is not valid JSON)
+    reloaded = ProgressTracker(tmp_path, serializer="compact")
+    scores = {e["id"]: e["score"] for e in reloaded.progress["modules"]["module_1"]["exercises_completed"]}
+    assert scores == {"ex_1_1": 1.0, "ex_1_2": 0.5}
+    reloaded.close()
@@ -1,28 +1,89 @@
 """
 ML Learning Platform Utilities
 Utilities for progress tracking, visualizations, and data loading
+
+Names are imported from their submodule on first access (PEP 562), so
+``from utils import get_tracker`` does not load matplotlib, nbconvert or
+pandas.
 """
 
-from .progress_tracker import ProgressTracker, get_tracker
-from .visualizations import (
-    setup_figure, plot_vector_2d, plot_matrix_heatmap,
-    plot_function_1d, plot_gradient_descent_path, plot_distribution,
-    plot_confusion_matrix, plot_learning_curve, plot_decision_boundary,
-    create_progress_dashboard, quick_plot
-)
-from .notebook_converter import NotebookConverter, export_notebook, batch_export_module
-from .dataset_loader import (
-    DatasetLoader, load_iris, load_titanic, load_boston_housing,
-    load_mnist, load_wine_quality, load_mall_customers
-)
+import importlib
+from typing import TYPE_CHECKING
+
+# Public name -> submodule that defines it
+_LAZY_IMPORTS = {
+    'ProgressTracker': 'progress_tracker', 'get_tracker': 'progress_tracker',
+    'TrackerService': 'tracker_service',
+    'cohort_tables': 'progress_analytics', 'cohort_report': 'progress_analytics',
+    'setup_figure': 'visualizations', 'plot_vector_2d': 'visualizations',
+    'plot_matrix_heatmap': 'visualizations', 'plot_function_1d': 'visualizations',
+    'plot_gradient_descent_path': 'visualizations', 'plot_distribution': 'visualizations',
+    'plot_confusion_matrix': 'visualizations', 'plot_learning_curve': 'visualizations',
+    'plot_decision_boundary': 'visualizations', 'create_progress_dashboard': 'visualizations',
+    'quick_plot': 'visualizations', 'apply_style': 'visualizations',
+    'warp_affine': 'image_transforms', 'rotate_image': 'image_transforms',
+    'scale_image': 'image_transforms', 'random_affine': 'image_transforms',
+    'AffinePipeline': 'image_transforms',
+    'numerical_derivative': 'optimization', 'numerical_gradient': 'optimization',
+    'gradient_descent_batch': 'optimization',
+    'randomized_svd': 'linalg', 'truncated_svd': 'linalg', 'low_rank_approximation': 'linalg',
+    'PCA': 'linalg', 'IncrementalPCA': 'linalg',
+    'NotebookConverter': 'notebook_converter', 'export_notebook': 'notebook_converter',
+    'batch_export_module': 'notebook_converter',
+    'BookBuilder': 'book_builder', 'build_book': 'book_builder',
+    'DatasetLoader': 'dataset_loader', 'load_iris': 'dataset_loader',
+    'load_titanic': 'dataset_loader', 'load_boston_housing': 'dataset_loader',
+    'load_mnist': 'dataset_loader', 'load_wine_quality': 'dataset_loader',
+    'load_mall_customers': 'dataset_loader',
+}
 
 __all__ = [
-    'ProgressTracker', 'get_tracker',
+    'ProgressTracker', 'get_tracker', 'TrackerService',
+    'cohort_tables', 'cohort_report',
     'setup_figure', 'plot_vector_2d', 'plot_matrix_heatmap',
     'plot_function_1d', 'plot_gradient_descent_path', 'plot_distribution',
     'plot_confusion_matrix', 'plot_learning_curve', 'plot_decision_boundary',
-    'create_progress_dashboard', 'quick_plot',
+    'create_progress_dashboard', 'quick_plot', 'apply_style',
+    'warp_affine', 'rotate_image', 'scale_image', 'random_affine', 'AffinePipeline',
+    'numerical_derivative', 'numerical_gradient', 'gradient_descent_batch',
+    'randomized_svd', 'truncated_svd', 'low_rank_approximation', 'PCA', 'IncrementalPCA',
     'NotebookConverter', 'export_notebook', 'batch_export_module',
+    'BookBuilder', 'build_book',
     'DatasetLoader', 'load_iris', 'load_titanic', 'load_boston_housing',
     'load_mnist', 'load_wine_quality', 'load_mall_customers'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    """Import a public name from its submodule on first access."""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_LAZY_IMPORTS[name]}", __name__), name)
+    # Cache it so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .progress_tracker import ProgressTracker, get_tracker
+    from .tracker_service import TrackerService
+    from .progress_analytics import cohort_tables, cohort_report
+    from .visualizations import (
+        setup_figure, plot_vector_2d, plot_matrix_heatmap,
+        plot_function_1d, plot_gradient_descent_path, plot_distribution,
+        plot_confusion_matrix, plot_learning_curve, plot_decision_boundary,
+        create_progress_dashboard, quick_plot, apply_style
+    )
+    from .image_transforms import warp_affine, rotate_image, scale_image, random_affine, AffinePipeline
+    from .optimization import numerical_derivative, numerical_gradient, gradient_descent_batch
+    from .linalg import randomized_svd, truncated_svd, low_rank_approximation, PCA, IncrementalPCA
+    from .notebook_converter import NotebookConverter, export_notebook, batch_export_module
+    from .book_builder import BookBuilder, build_book
+    from .dataset_loader import (
+        DatasetLoader, load_iris, load_titanic, load_boston_housing,
+        load_mnist, load_wine_quality, load_mall_customers
+    )
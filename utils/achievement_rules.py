@@ -0,0 +1,260 @@
+"""
+Achievement rules
+Declarative, incremental achievement checks driven by tracker events
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+
+class AchievementRule:
+    """
+    One achievement and the condition that unlocks it.
+    
+    A rule subscribes to the event types it depends on (``events``) and keeps
+    its own counters: ``reset`` builds them once from the full progress
+    state, ``update`` adjusts them for a single event that has just been
+    applied. The engine only calls the rules subscribed to an event, so the
+    cost of checking achievements does not grow with the progress history.
+    """
+    
+    events: Tuple[str, ...] = ()
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def reset(self, progress: Dict[str, Any]):
+        """Rebuild counters from the full progress state."""
+    
+    def update(self, event: Dict[str, Any], progress: Dict[str, Any]) -> bool:
+        """
+        Account for one applied event.
+        
+        Args:
+            event: The event, already applied to progress
+            progress: Progress state after the event
+            
+        Returns:
+            True if the achievement condition is met
+        """
+        raise NotImplementedError
+
+
+class ModulesCompletedRule(AchievementRule):
+    """Complete at least ``count`` modules."""
+    
+    events = ("lesson_completed",)
+    
+    def __init__(self, name: str, count: int = 1):
+        super().__init__(name)
+        self.count = count
+        self.completed = set()
+    
+    def reset(self, progress):
+        self.completed = {m for m, d in progress["modules"].items() if d["completed"]}
+    
+    def update(self, event, progress):
+        if progress["modules"][event["module"]]["completed"]:
+            self.completed.add(event["module"])
+        return len(self.completed) >= self.count
+
+
+class LessonsCompletedRule(AchievementRule):
+    """Complete at least ``count`` lessons/projects in the given modules."""
+    
+    events = ("lesson_completed",)
+    
+    def __init__(self, name: str, modules: Iterable[str], count: int):
+        super().__init__(name)
+        self.modules = tuple(modules)
+        self.count = count
+        self.lessons: Dict[str, int] = {}
+    
+    def reset(self, progress):
+        self.lessons = {m: len(progress["modules"][m]["lessons_completed"])
+                        for m in self.modules if m in progress["modules"]}
+    
+    def update(self, event, progress):
+        module = event["module"]
+        if module in self.lessons:
+            self.lessons[module] = len(progress["modules"][module]["lessons_completed"])
+        return sum(self.lessons.values()) >= self.count
+
+
+class StreakRule(AchievementRule):
+    """Study ``days`` days in a row."""
+    
+    events = ("session_ended",)
+    
+    def __init__(self, name: str, days: int):
+        super().__init__(name)
+        self.days = days
+    
+    def update(self, event, progress):
+        return progress["user_info"]["current_streak_days"] >= self.days
+
+
+class CapstoneGradeRule(AchievementRule):
+    """Complete a capstone with at least ``min_grade``."""
+    
+    events = ("capstone_completed",)
+    
+    def __init__(self, name: str, min_grade: float):
+        super().__init__(name)
+        self.min_grade = min_grade
+    
+    def update(self, event, progress):
+        return event["grade"] >= self.min_grade
+
+
+class CurriculumCompletedRule(AchievementRule):
+    """Complete every module and every capstone."""
+    
+    events = ("lesson_completed", "capstone_completed")
+    
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.modules = set()
+        self.capstones = set()
+    
+    def reset(self, progress):
+        self.modules = {m for m, d in progress["modules"].items() if d["completed"]}
+        self.capstones = {p for p, d in progress["capstones"].items() if d["completed"]}
+    
+    def update(self, event, progress):
+        if event["type"] == "lesson_completed":
+            if progress["modules"][event["module"]]["completed"]:
+                self.modules.add(event["module"])
+        else:
+            self.capstones.add(event["project"])
+        return (len(self.modules) == len(progress["modules"])
+                and len(self.capstones) == len(progress["capstones"]))
+
+
+class FastModuleRule(AchievementRule):
+    """
+    Complete a module less than ``days`` days after first working on it.
+    
+    First activity is the earliest session, lesson or exercise in the module
+    seen by the rule; after a reload it is taken from the exercise timestamps
+    and the days the module was visited.
+    """
+    
+    events = ("session_ended", "lesson_completed", "exercise_completed")
+    
+    def __init__(self, name: str, days: int):
+        super().__init__(name)
+        self.days = days
+        self.first_seen: Dict[str, datetime] = {}
+    
+    def reset(self, progress):
+        self.first_seen = {}
+        for module, data in progress["modules"].items():
+            for exercise in data["exercises_completed"]:
+                self._seen(module, datetime.fromisoformat(exercise["completed_at"]))
+        for day, activity in progress["daily_activity"].items():
+            for module in activity["modules_visited"]:
+                self._seen(module, datetime.fromisoformat(day))
+    
+    def _seen(self, module: str, when: datetime):
+        if module not in self.first_seen or when < self.first_seen[module]:
+            self.first_seen[module] = when
+    
+    def update(self, event, progress):
+        module = event["module"]
+        at = datetime.fromisoformat(event["at"])
+        if event["type"] == "session_ended":
+            self._seen(module, at - timedelta(minutes=event["duration_minutes"]))
+        else:
+            self._seen(module, at)
+        
+        if event["type"] != "lesson_completed" or not progress["modules"][module]["completed"]:
+            return False
+        return at - self.first_seen[module] < timedelta(days=self.days)
+
+
+class PerfectModuleRule(AchievementRule):
+    """Complete a module (any, or one of ``modules``) with every exercise scored 100%."""
+    
+    events = ("lesson_completed", "exercise_completed")
+    
+    def __init__(self, name: str, modules: Optional[Iterable[str]] = None):
+        super().__init__(name)
+        self.modules = set(modules) if modules is not None else None
+        self.exercises = defaultdict(int)
+        self.imperfect = defaultdict(int)
+    
+    def reset(self, progress):
+        self.exercises = defaultdict(int)
+        self.imperfect = defaultdict(int)
+        for module, data in progress["modules"].items():
+            for exercise in data["exercises_completed"]:
+                self._count(module, exercise["score"])
+    
+    def _count(self, module: str, score: float):
+        self.exercises[module] += 1
+        if score < 1.0:
+            self.imperfect[module] += 1
+    
+    def update(self, event, progress):
+        module = event["module"]
+        if self.modules is not None and module not in self.modules:
+            return False
+        # The tracker only passes on exercises completed for the first time
+        if event["type"] == "exercise_completed":
+            self._count(module, event["score"])
+        
+        return (progress["modules"][module]["completed"]
+                and self.exercises[module] > 0 and self.imperfect[module] == 0)
+
+
+def default_rules() -> List[AchievementRule]:
+    """The rules behind the achievements every new learner starts with."""
+    return [
+        ModulesCompletedRule("scholar", count=1),
+        PerfectModuleRule("mathematician", modules=["module_1"]),
+        PerfectModuleRule("statistician", modules=["module_2"]),
+        LessonsCompletedRule("ml_engineer", modules=["module_3", "module_4"], count=5),
+        CapstoneGradeRule("deep_learning_expert", min_grade=95),
+        StreakRule("consistent_learner", days=30),
+        CurriculumCompletedRule("master"),
+        FastModuleRule("speed_demon", days=3),
+        PerfectModuleRule("perfectionist"),
+    ]
+
+
+class AchievementEngine:
+    """Dispatch applied events to the rules subscribed to their type."""
+    
+    def __init__(self, rules: Optional[Iterable[AchievementRule]] = None):
+        """
+        Initialize the engine.
+        
+        Args:
+            rules: Achievement rules (default: default_rules())
+        """
+        self.rules = list(rules) if rules is not None else default_rules()
+        self._subscribers: Dict[str, List[AchievementRule]] = defaultdict(list)
+        for rule in self.rules:
+            for event_type in rule.events:
+                self._subscribers[event_type].append(rule)
+    
+    def reset(self, progress: Dict[str, Any]):
+        """Rebuild every rule's counters from the full progress state."""
+        for rule in self.rules:
+            rule.reset(progress)
+    
+    def evaluate(self, event: Dict[str, Any], progress: Dict[str, Any]) -> List[str]:
+        """
+        Update the rules subscribed to an applied event.
+        
+        Args:
+            event: The event, already applied to progress
+            progress: Progress state after the event
+            
+        Returns:
+            Names of achievements whose condition is met
+        """
+        return [rule.name for rule in self._subscribers.get(event["type"], ())
+                if rule.update(event, progress)]
@@ -0,0 +1,319 @@
+"""
+Book build utilities
+Build the notebooks listed in book/_toc.yml in parallel, without duplicate work
+"""
+
+import argparse
+import filecmp
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+from .notebook_converter import NotebookConverter
+
+
+def _build_job(base_path: str, notebook_path: str, entry: str,
+               formats: List[str], execute: bool) -> Dict[str, str]:
+    """Execute (optionally) and export one notebook; runs in a worker process."""
+    converter = NotebookConverter(base_path, fast_read=True)
+    # Outputs mirror the book layout so module_1/intro and module_2/intro do not collide
+    return {
+        format: converter.export_notebook(notebook_path, format, execute, output_name=entry)
+        for format in formats
+    }
+
+
+class BookBuilder:
+    """
+    Build the book from its table of contents.
+    
+    Notebooks are read from ``_toc.yml`` in book order, identical notebooks
+    (same content hash) are built once, and independent notebooks are built
+    in parallel worker processes. Outputs are written under the entry's path
+    relative to the book root and cached per entry with its content hash, so
+    an unchanged notebook is never rebuilt. Duplicate entries get a copy of
+    the outputs at their own path.
+    
+    A notebook can declare that it must be built after other toc entries
+    (e.g. because it reads files they write) in its metadata::
+    
+        "metadata": {"book": {"depends_on": ["module_1/project_1_1_array_operations"]}}
+    """
+    
+    def __init__(self, base_path: str = ".", book_dir: str = "book"):
+        """
+        Initialize book builder.
+        
+        Args:
+            base_path: Base directory for the learning platform
+            book_dir: Book directory containing _toc.yml, relative to base_path
+        """
+        self.base_path = Path(base_path)
+        self.book_dir = self.base_path / book_dir
+        self.toc_file = self.book_dir / "_toc.yml"
+        self.cache_file = self.base_path / "exports" / ".cache" / "book" / "manifest.json"
+    
+    def read_toc(self) -> List[str]:
+        """
+        List toc entries in book order.
+        
+        Returns:
+            Toc file entries (paths relative to the book directory, no extension)
+        """
+        import yaml
+        
+        with open(self.toc_file, 'r', encoding='utf-8') as f:
+            toc = yaml.safe_load(f)
+        
+        entries = []
+        
+        def walk(items):
+            for item in items or []:
+                if "file" in item:
+                    entries.append(item["file"])
+                walk(item.get("sections"))
+                walk(item.get("chapters"))
+        
+        if toc.get("root"):
+            entries.append(toc["root"])
+        walk(toc.get("parts"))
+        walk(toc.get("chapters"))
+        return entries
+    
+    def _resolve(self, entry: str) -> Optional[Path]:
+        """Find the source file of a toc entry."""
+        for suffix in (".ipynb", ".md"):
+            path = self.book_dir / f"{entry}{suffix}"
+            if path.exists():
+                return path
+        return None
+    
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if self.cache_file.exists():
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        return {}
+    
+    def _save_cache(self, cache: Dict[str, Dict[str, Any]]):
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_file, 'w') as f:
+            json.dump(cache, f, indent=2)
+    
+    def plan(self) -> Dict[str, Any]:
+        """
+        Resolve the toc into unique notebook jobs and their dependencies.
+        
+        Returns:
+            Dict with 'entries' (per toc entry: file, source, kind, hash) and
+            'jobs' (content hash -> notebook path, toc entry and hashes it
+            depends on)
+        """
+        entries = []
+        jobs: Dict[str, Dict[str, Any]] = {}
+        hash_by_entry = {}
+        
+        for entry in self.read_toc():
+            source = self._resolve(entry)
+            info = {"file": entry, "source": str(source) if source else None, "hash": None}
+            
+            if source is None:
+                info["kind"] = "missing"
+            elif source.suffix == ".md":
+                info["kind"] = "markdown"
+            else:
+                raw = source.read_bytes()
+                digest = hashlib.sha256(raw).hexdigest()
+                info["kind"] = "notebook"
+                info["hash"] = digest
+                hash_by_entry[entry] = digest
+                
+                if digest not in jobs:
+                    try:
+                        depends_on = json.loads(raw).get("metadata", {}).get("book", {}).get("depends_on", [])
+                    except ValueError:
+                        # Broken notebooks still get a job so the failure is reported
+                        depends_on = []
+                    jobs[digest] = {"notebook": str(source), "entry": entry, "depends_on": depends_on}
+            
+            entries.append(info)
+        
+        for job in jobs.values():
+            job["depends_on"] = sorted({
+                hash_by_entry[dep] for dep in job["depends_on"] if dep in hash_by_entry
+            })
+        
+        return {"entries": entries, "jobs": jobs}
+    
+    def build(self, formats: List[str] = ("html",),
+              execute: bool = False,
+              max_workers: Optional[int] = None,
+              use_cache: bool = True) -> List[Dict[str, Any]]:
+        """
+        Build every notebook in the toc.
+        
+        Args:
+            formats: Export formats to produce
+            execute: Whether to execute notebooks before export
+            max_workers: Parallel worker processes (default: number of CPUs)
+            use_cache: Reuse outputs of notebooks built before with the same content
+            
+        Returns:
+            One dict per toc entry with 'file', 'source', 'status' ('built',
+            'cached', 'duplicate', 'markdown', 'missing', 'failed' or
+            'skipped'), 'outputs' and 'error'
+        """
+        formats = [formats] if isinstance(formats, str) else list(formats)
+        plan = self.plan()
+        jobs = plan["jobs"]
+        
+        cache = self._load_cache() if use_cache else {}
+        variant = "executed" if execute else "plain"
+        
+        def cache_key(digest):
+            return f"{jobs[digest]['entry']}:{variant}"
+        
+        def cached_outputs(digest):
+            # An entry's outputs are overwritten when its content changes, so
+            # they only count if they were built from this exact content
+            cached = cache.get(cache_key(digest), {})
+            outputs = cached.get("outputs", {})
+            if cached.get("hash") == digest and all(f in outputs and Path(outputs[f]).exists() for f in formats):
+                return {f: outputs[f] for f in formats}
+            return None
+        
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        for digest in jobs:
+            outputs = cached_outputs(digest)
+            if outputs is not None:
+                outcomes[digest] = {"status": "cached", "outputs": outputs, "error": None}
+        
+        remaining = {d for d in jobs if d not in outcomes}
+        running = {}
+        
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+            while remaining or running:
+                # Jobs whose dependencies failed cannot be built
+                for digest in sorted(remaining):
+                    failed = [d for d in jobs[digest]["depends_on"]
+                              if outcomes.get(d, {}).get("status") in ("failed", "skipped")]
+                    if failed:
+                        remaining.discard(digest)
+                        outcomes[digest] = {
+                            "status": "skipped",
+                            "outputs": {},
+                            "error": f"Dependency failed: {jobs[failed[0]]['notebook']}"
+                        }
+                
+                ready = [d for d in remaining
+                         if all(dep in outcomes for dep in jobs[d]["depends_on"])]
+                for digest in ready:
+                    remaining.discard(digest)
+                    future = pool.submit(_build_job, str(self.base_path), jobs[digest]["notebook"],
+                                         jobs[digest]["entry"], formats, execute)
+                    running[future] = digest
+                
+                if not running:
+                    # Only dependency cycles are left
+                    for digest in remaining:
+                        outcomes[digest] = {"status": "failed", "outputs": {},
+                                            "error": "Dependency cycle"}
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    digest = running.pop(future)
+                    try:
+                        outputs = future.result()
+                        outcomes[digest] = {"status": "built", "outputs": outputs, "error": None}
+                        cached = cache.get(cache_key(digest), {})
+                        if cached.get("hash") != digest:
+                            cached = {"hash": digest, "outputs": {}}
+                        cached["outputs"].update(outputs)
+                        cache[cache_key(digest)] = cached
+                    except Exception as e:
+                        outcomes[digest] = {"status": "failed", "outputs": {},
+                                            "error": f"{type(e).__name__}: {e}"}
+        
+        self._save_cache(cache)
+        
+        results = []
+        seen = set()
+        for info in plan["entries"]:
+            result = {"file": info["file"], "source": info["source"],
+                      "status": info["kind"], "outputs": {}, "error": None}
+            if info["kind"] == "notebook":
+                outcome = outcomes[info["hash"]]
+                result.update(outcome)
+                if info["hash"] in seen and outcome["status"] in ("built", "cached"):
+                    result["status"] = "duplicate"
+                    result["outputs"] = self._copy_outputs(outcome["outputs"], jobs[info["hash"]]["entry"],
+                                                           info["file"])
+                seen.add(info["hash"])
+            results.append(result)
+        
+        return results
+    
+    @staticmethod
+    def _copy_outputs(outputs: Dict[str, str], entry: str, duplicate: str) -> Dict[str, str]:
+        """Copy the outputs built for one toc entry to the paths of an identical entry."""
+        copies = {}
+        for format, output in outputs.items():
+            output = Path(output)
+            # Outputs live at <format dir>/<entry><suffix>
+            format_dir = output.parents[len(Path(entry).parts) - 1]
+            target = format_dir / f"{duplicate}{output.suffix}"
+            if not (target.exists() and filecmp.cmp(output, target, shallow=False)):
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(output, target)
+            copies[format] = str(target)
+        return copies
+
+
+def build_book(base_path: str = ".", formats: List[str] = ("html",),
+               execute: bool = False, max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Convenience function to build all notebooks in book/_toc.yml.
+    
+    Args:
+        base_path: Base directory for the learning platform
+        formats: Export formats
+        execute: Whether to execute notebooks before export
+        max_workers: Parallel worker processes (default: number of CPUs)
+        
+    Returns:
+        List of per-entry result dicts
+    """
+    builder = BookBuilder(base_path)
+    return builder.build(formats, execute, max_workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the notebooks listed in book/_toc.yml")
+    parser.add_argument("--base-path", default=".", help="Base directory of the learning platform")
+    parser.add_argument("--format", action="append", dest="formats",
+                        help="Export format (pdf, py, html); repeat for several")
+    parser.add_argument("--execute", action="store_true", help="Execute notebooks before export")
+    parser.add_argument("--jobs", type=int, default=None, help="Parallel worker processes")
+    args = parser.parse_args()
+    
+    results = build_book(args.base_path, args.formats or ["html"], args.execute, args.jobs)
+    
+    for result in results:
+        status = result["status"]
+        if status in ("built", "cached", "duplicate"):
+            print(f"✓ {status:<9} {result['file']}")
+        elif status in ("failed", "skipped"):
+            print(f"✗ {status:<9} {result['file']}: {result['error']}")
+    
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    print(", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+
+
+if __name__ == "__main__":
+    main()
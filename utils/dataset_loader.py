@@ -7,7 +7,7 @@ import os
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, Iterator
 import pickle
 
 
@@ -33,6 +33,9 @@ class DatasetLoader:
         self.data_dir.mkdir(exist_ok=True)
         self.raw_dir.mkdir(exist_ok=True)
         self.processed_dir.mkdir(exist_ok=True)
+        
+        # Whether iter_mnist_chunks fell back to synthetic data (None: not used yet)
+        self.mnist_synthetic: Optional[bool] = None
     
     def load_iris(self) -> pd.DataFrame:
         """
@@ -161,6 +164,58 @@ class DatasetLoader:
             print("Warning: Could not load MNIST. Creating synthetic version.")
             return self._create_synthetic_mnist(n_samples or 70000)
     
+    def iter_mnist_chunks(self, chunk_size: int = 10000,
+                          n_samples: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Iterate over MNIST in chunks with bounded memory.
+        
+        The first call caches the dataset as .npy files in data/processed;
+        later calls memory-map them, so only the current chunk is in memory.
+        If MNIST cannot be downloaded (no network or no scikit-learn), the
+        synthetic stand-in is used and cached under separate file names, so
+        it is never served as MNIST once the download works. Check
+        ``mnist_synthetic`` to see which data was used.
+        
+        Args:
+            chunk_size: Samples per chunk
+            n_samples: Number of samples to iterate over (None = all)
+            
+        Yields:
+            Tuples of (X_chunk, y_chunk) arrays
+        """
+        x_file = self.processed_dir / "mnist_X.npy"
+        y_file = self.processed_dir / "mnist_y.npy"
+        self.mnist_synthetic = False
+        
+        if not (x_file.exists() and y_file.exists()):
+            try:
+                X, y = self._fetch_mnist()
+            except Exception as e:
+                print(f"Warning: Could not load MNIST ({type(e).__name__}). Using synthetic version.")
+                self.mnist_synthetic = True
+                x_file = self.processed_dir / "mnist_synthetic_X.npy"
+                y_file = self.processed_dir / "mnist_synthetic_y.npy"
+                if not (x_file.exists() and y_file.exists()):
+                    X, y = self._create_synthetic_mnist(70000)
+            if not (x_file.exists() and y_file.exists()):
+                np.save(x_file, np.asarray(X, dtype=np.float32))
+                np.save(y_file, np.asarray(y))
+        
+        X = np.load(x_file, mmap_mode='r')
+        y = np.load(y_file)
+        total = len(X) if n_samples is None else min(n_samples, len(X))
+        
+        for start in range(0, total, chunk_size):
+            stop = min(start + chunk_size, total)
+            yield np.asarray(X[start:stop], dtype=float), y[start:stop]
+    
+    def _fetch_mnist(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Download MNIST from OpenML; raises if it is unavailable."""
+        from sklearn.datasets import fetch_openml
+        
+        mnist = fetch_openml('mnist_784', version=1, parser='auto', as_frame=False)
+        return mnist.data, mnist.target.astype(int)
+    
     def _create_synthetic_mnist(self, n_samples: int) -> Tuple[np.ndarray, np.ndarray]:
         """Create synthetic MNIST-like data."""
         np.random.seed(42)
@@ -0,0 +1,410 @@
+"""
+Incremental notebook execution
+Re-execute only edited cells and the cells that depend on them
+"""
+
+import ast
+import atexit
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Optional, List, Dict, Set, Tuple, Any
+
+import nbformat
+from nbclient import NotebookClient
+from nbclient.util import run_sync
+
+
+# Lines handled by IPython rather than Python (magics, shell escapes, help)
+MAGIC_LINE = re.compile(r"^(\s*)(%|!|\?)")
+
+
+class _NameCollector(ast.NodeVisitor):
+    """Collect global names a cell binds and names it reads."""
+    
+    def __init__(self):
+        self.defines: Set[str] = set()
+        self.uses: Set[str] = set()
+        self.star_import = False
+        self._scopes: List[Set[str]] = []  # local names of enclosing nested scopes
+    
+    def _bind(self, name: str):
+        if not self._scopes:
+            self.defines.add(name)
+    
+    def _mutate(self, node):
+        # ``df['a'] = 1`` or ``items.append(x)`` changes an existing object
+        while isinstance(node, (ast.Attribute, ast.Subscript)):
+            node = node.value
+        if isinstance(node, ast.Name):
+            self.uses.add(node.id)
+            self._bind(node.id)
+    
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            if not any(node.id in scope for scope in self._scopes):
+                self.uses.add(node.id)
+        else:
+            self._bind(node.id)
+    
+    def visit_AugAssign(self, node):
+        if isinstance(node.target, ast.Name):
+            self.uses.add(node.target.id)
+        self.generic_visit(node)
+    
+    def visit_Attribute(self, node):
+        if not isinstance(node.ctx, ast.Load):
+            self._mutate(node)
+        self.generic_visit(node)
+    
+    visit_Subscript = visit_Attribute
+    
+    def visit_Expr(self, node):
+        if isinstance(node.value, ast.Call) and isinstance(node.value.func, ast.Attribute):
+            self._mutate(node.value.func.value)
+        self.generic_visit(node)
+    
+    def visit_Import(self, node):
+        for alias in node.names:
+            self._bind(alias.asname or alias.name.split('.')[0])
+    
+    def visit_ImportFrom(self, node):
+        for alias in node.names:
+            if alias.name == '*':
+                self.star_import = True
+            else:
+                self._bind(alias.asname or alias.name)
+    
+    def visit_Global(self, node):
+        self.defines.update(node.names)
+    
+    def _visit_scope(self, nodes, local_names: Set[str]):
+        self._scopes.append(local_names)
+        for child in nodes:
+            self.visit(child)
+        self._scopes.pop()
+    
+    @staticmethod
+    def _local_names(args, body) -> Set[str]:
+        """Parameters and names assigned in a function body, minus globals."""
+        names = {a.arg for a in args.posonlyargs + args.args + args.kwonlyargs}
+        names.update(a.arg for a in (args.vararg, args.kwarg) if a is not None)
+        declared_global = set()
+        for stmt in body:
+            for node in ast.walk(stmt):
+                if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+                    names.add(node.id)
+                elif isinstance(node, (ast.Global, ast.Nonlocal)):
+                    declared_global.update(node.names)
+        return names - declared_global
+    
+    def visit_FunctionDef(self, node):
+        for child in node.decorator_list + node.args.defaults + node.args.kw_defaults:
+            if child is not None:
+                self.visit(child)
+        self._bind(node.name)
+        self._visit_scope(node.body, self._local_names(node.args, node.body))
+    
+    visit_AsyncFunctionDef = visit_FunctionDef
+    
+    def visit_ClassDef(self, node):
+        for child in node.decorator_list + node.bases + node.keywords:
+            self.visit(child)
+        self._bind(node.name)
+        self._visit_scope(node.body, set())
+    
+    def visit_Lambda(self, node):
+        for child in node.args.defaults + node.args.kw_defaults:
+            if child is not None:
+                self.visit(child)
+        self._visit_scope([node.body], self._local_names(node.args, []))
+    
+    def _visit_comprehension(self, node):
+        # Comprehension variables are local to the comprehension
+        targets = {
+            n.id for gen in node.generators for n in ast.walk(gen.target)
+            if isinstance(n, ast.Name)
+        }
+        self._scopes.append(targets)
+        self.generic_visit(node)
+        self._scopes.pop()
+    
+    visit_ListComp = visit_SetComp = visit_GeneratorExp = visit_DictComp = _visit_comprehension
+
+
+def analyze_cell(source: str) -> Tuple[Optional[Set[str]], Optional[Set[str]]]:
+    """
+    Find the global names a code cell defines and uses.
+    
+    Objects mutated in place (item assignment, method call statements) count
+    as both used and redefined.
+    
+    Args:
+        source: Cell source code
+        
+    Returns:
+        Tuple of (defines, uses); (None, None) if the cell cannot be analysed
+        (cell magics, star imports, syntax errors) and must be treated as
+        touching every name
+    """
+    if source.lstrip().startswith('%%'):
+        return None, None
+    
+    # Line magics and shell escapes cannot be analysed, keep line numbers intact
+    python_source = '\n'.join(
+        MAGIC_LINE.sub(r'\1pass #', line) for line in source.splitlines()
+    )
+    
+    try:
+        tree = ast.parse(python_source)
+    except SyntaxError:
+        return None, None
+    
+    collector = _NameCollector()
+    collector.visit(tree)
+    if collector.star_import:
+        return None, None
+    
+    return collector.defines, collector.uses
+
+
+def _source_hash(source: str) -> str:
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def _cell_key(cell, index: int) -> str:
+    """Stable identity of a cell across edits (cell id, else position)."""
+    return cell.get('id') or f"index-{index}"
+
+
+def plan_execution(cells: List[Dict[str, Any]],
+                   previous: Dict[str, Dict[str, Any]],
+                   kernel_has_state: bool) -> List[int]:
+    """
+    Decide which code cells must run.
+    
+    A cell reruns if it is new or edited, reads a name that an earlier rerun
+    cell (re)defined, or itself redefines such a name (so the kernel ends up
+    with the same final value as a full run). With a fresh kernel, every cell
+    providing a name needed by a rerun cell is added as well.
+    
+    Args:
+        cells: Per code cell dicts with 'key', 'hash', 'defines' and 'uses'
+            (defines/uses None for cells that cannot be analysed)
+        previous: Cached cell records from the last run, keyed by cell key
+        kernel_has_state: Whether a kernel holding the previous run's state is alive
+        
+    Returns:
+        Sorted positions (into ``cells``) to execute
+    """
+    stale: Set[str] = set()
+    everything_stale = False
+    
+    # Names defined by cells that were deleted no longer hold their old meaning
+    current_keys = {c['key'] for c in cells}
+    for key, record in previous.items():
+        if key not in current_keys:
+            if record.get('defines') is None:
+                everything_stale = True
+            else:
+                stale.update(record['defines'])
+    
+    rerun = set()
+    for i, cell in enumerate(cells):
+        record = previous.get(cell['key'])
+        edited = record is None or record['hash'] != cell['hash']
+        defines, uses = cell['defines'], cell['uses']
+        
+        opaque = defines is None
+        touches_stale = everything_stale or (opaque and bool(stale)) or (
+            not opaque and bool((uses | defines) & stale)
+        )
+        
+        if edited or touches_stale:
+            rerun.add(i)
+            if opaque or (record is not None and record.get('defines') is None):
+                everything_stale = True
+            else:
+                stale.update(defines)
+                if record is not None:
+                    stale.update(record['defines'])
+    
+    if kernel_has_state:
+        return sorted(rerun)
+    
+    # Fresh kernel: pull in the latest earlier provider of every name needed
+    needed = set(rerun)
+    for j in range(len(cells) - 1, -1, -1):
+        if j not in needed:
+            continue
+        uses = cells[j]['uses']
+        for i in range(j - 1, -1, -1):
+            defines = cells[i]['defines']
+            if uses is None or defines is None:
+                needed.add(i)
+                continue
+            provided = uses & defines
+            if provided:
+                needed.add(i)
+                uses = uses - provided
+            if uses is not None and not uses:
+                break
+    
+    return sorted(needed)
+
+
+class IncrementalExecutor:
+    """
+    Execute notebooks incrementally, reusing cached outputs of clean cells.
+    
+    One kernel per notebook is kept alive for the lifetime of the executor,
+    so after the first run only edited cells and their dependents execute.
+    When no live kernel exists (new process, dead kernel), the cells that
+    provide their inputs are executed too. Kernels are shut down by close()
+    or at interpreter exit.
+    """
+    
+    def __init__(self, cache_dir: str, kernel_name: str = 'python3', timeout: int = 600):
+        """
+        Initialize executor.
+        
+        Args:
+            cache_dir: Directory for per-notebook output caches
+            kernel_name: Jupyter kernel to execute with
+            timeout: Execution limit in seconds per cell
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.kernel_name = kernel_name
+        self.timeout = timeout
+        
+        # notebook path -> (client, cell records the kernel state reflects)
+        self._sessions: Dict[str, Tuple[NotebookClient, Dict[str, Dict]]] = {}
+        atexit.register(self.close)
+    
+    def _cache_file(self, notebook_path: Path) -> Path:
+        digest = hashlib.sha256(str(notebook_path.resolve()).encode('utf-8')).hexdigest()[:12]
+        return self.cache_dir / f"{notebook_path.stem}-{digest}.json"
+    
+    def _load_cache(self, notebook_path: Path) -> Dict[str, Dict]:
+        cache_file = self._cache_file(notebook_path)
+        if cache_file.exists():
+            with open(cache_file, 'r') as f:
+                cached = json.load(f)
+            if cached.get('kernel_name') == self.kernel_name:
+                return cached['cells']
+        return {}
+    
+    def _save_cache(self, notebook_path: Path, records: Dict[str, Dict]):
+        with open(self._cache_file(notebook_path), 'w') as f:
+            json.dump({'kernel_name': self.kernel_name, 'cells': records}, f)
+    
+    def _start_session(self, nb, notebook_path: Path) -> NotebookClient:
+        client = NotebookClient(
+            nb,
+            timeout=self.timeout,
+            kernel_name=self.kernel_name,
+            resources={'metadata': {'path': notebook_path.parent}}
+        )
+        client.km = client.create_kernel_manager()
+        client.start_new_kernel()
+        client.start_new_kernel_client()
+        return client
+    
+    def _live_session(self, key: str):
+        session = self._sessions.get(key)
+        if session is None:
+            return None
+        client = session[0]
+        if client.km is not None and run_sync(client.km.is_alive)():
+            return session
+        self._stop(key)
+        return None
+    
+    def _stop(self, key: str):
+        client, _ = self._sessions.pop(key)
+        if client.km is not None:
+            # Same cleanup nbclient performs when leaving setup_kernel()
+            client._cleanup_kernel()
+    
+    def execute(self, nb, notebook_path) -> Dict[str, List[int]]:
+        """
+        Execute a notebook in place, rerunning only what changed.
+        
+        Args:
+            nb: NotebookNode read from ``notebook_path``
+            notebook_path: Path of the notebook (used for cache and kernel cwd)
+            
+        Returns:
+            Dict with 'executed' and 'reused' lists of cell indices
+        """
+        notebook_path = Path(notebook_path)
+        key = str(notebook_path.resolve())
+        
+        code_cells = []
+        for index, cell in enumerate(nb.cells):
+            if cell.cell_type != 'code':
+                continue
+            defines, uses = analyze_cell(cell.source)
+            code_cells.append({
+                'index': index,
+                'key': _cell_key(cell, index),
+                'hash': _source_hash(cell.source),
+                'defines': defines,
+                'uses': uses
+            })
+        
+        session = self._live_session(key)
+        if session is not None:
+            client, previous = session
+        else:
+            client, previous = None, self._load_cache(notebook_path)
+        
+        to_run = set(plan_execution(code_cells, previous, kernel_has_state=session is not None))
+        
+        if client is None and to_run:
+            client = self._start_session(nb, notebook_path)
+            self._sessions[key] = (client, {})
+        if client is not None:
+            client.nb = nb
+            client.reset_execution_trackers()
+        
+        records = {}
+        executed, reused = [], []
+        try:
+            for position, info in enumerate(code_cells):
+                cell = nb.cells[info['index']]
+                if position in to_run:
+                    client.execute_cell(cell, info['index'])
+                    executed.append(info['index'])
+                else:
+                    cached = previous[info['key']]
+                    cell.outputs = [nbformat.from_dict(o) for o in cached['outputs']]
+                    cell.execution_count = cached['execution_count']
+                    reused.append(info['index'])
+                
+                records[info['key']] = {
+                    'hash': info['hash'],
+                    'defines': sorted(info['defines']) if info['defines'] is not None else None,
+                    'outputs': cell.outputs,
+                    'execution_count': cell.execution_count
+                }
+        except Exception:
+            # Kernel state no longer matches any record, start clean next time
+            if key in self._sessions:
+                self._stop(key)
+            raise
+        
+        # Keep the in-memory copy identical to what a later process loads
+        records = json.loads(json.dumps(records))
+        if client is not None:
+            self._sessions[key] = (client, records)
+        self._save_cache(notebook_path, records)
+        
+        return {'executed': executed, 'reused': reused}
+    
+    def close(self):
+        """Shut down all kernels kept alive by this executor."""
+        for key in list(self._sessions):
+            self._stop(key)
@@ -0,0 +1,345 @@
+"""
+Linear algebra utilities
+Randomized truncated SVD, low-rank compression and PCA that scale to full datasets
+"""
+
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+
+# Rows per block when a pass over the data is chunked
+_CHUNK_ROWS = 10_000
+
+
+def randomized_svd(A: np.ndarray, k: int, n_oversamples: int = 10, n_iter: int = 4,
+                   seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Approximate the top-k singular triplets with a randomized range finder.
+    
+    A is multiplied by a random (n, k + n_oversamples) matrix and a few
+    power iterations sharpen the captured range; the SVD is then taken of a
+    small (k + n_oversamples, n) matrix instead of A (Halko et al., 2011).
+    Cost is O(m n k) instead of O(m n min(m, n)).
+    
+    Args:
+        A: Matrix (m, n)
+        k: Number of singular values/vectors
+        n_oversamples: Extra random directions for accuracy
+        n_iter: Power iterations (more helps when singular values decay slowly)
+        seed: Random seed
+        
+    Returns:
+        U (m, k), S (k,), Vt (k, n) like np.linalg.svd(A, full_matrices=False)
+    """
+    A = np.asarray(A, dtype=float)
+    rng = np.random.default_rng(seed)
+    m, n = A.shape
+    rank = min(k + n_oversamples, m, n)
+    
+    Q = np.linalg.qr(A @ rng.standard_normal((n, rank)))[0]
+    for _ in range(n_iter):
+        # Re-orthonormalize each half step to keep small singular directions
+        Q = np.linalg.qr(A.T @ Q)[0]
+        Q = np.linalg.qr(A @ Q)[0]
+    
+    U_small, S, Vt = np.linalg.svd(Q.T @ A, full_matrices=False)
+    return (Q @ U_small)[:, :k], S[:k], Vt[:k]
+
+
+def truncated_svd(A: np.ndarray, k: int, method: str = "auto",
+                  seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Top-k SVD, randomized when that is much cheaper than the full decomposition.
+    
+    Args:
+        A: Matrix (m, n)
+        k: Number of singular values/vectors
+        method: 'full', 'randomized' or 'auto' (randomized when k is small
+            compared to min(m, n))
+        seed: Random seed for the randomized method
+        
+    Returns:
+        U (m, k), S (k,), Vt (k, n)
+    """
+    if method == "auto":
+        method = "randomized" if min(np.shape(A)) > 200 and k < min(np.shape(A)) // 10 else "full"
+    if method == "randomized":
+        return randomized_svd(A, k, seed=seed)
+    if method != "full":
+        raise ValueError(f"Unknown SVD method: {method}")
+    U, S, Vt = np.linalg.svd(np.asarray(A, dtype=float), full_matrices=False)
+    return U[:, :k], S[:k], Vt[:k]
+
+
+def low_rank_approximation(image: np.ndarray, k: int, method: str = "auto") -> Tuple[np.ndarray, float]:
+    """
+    Compress an image with a rank-k SVD approximation.
+    
+    Args:
+        image: Image (H, W) or (H, W, C); channels are compressed separately
+        k: Rank to keep
+        method: SVD method, see truncated_svd
+        
+    Returns:
+        Tuple of (reconstructed image, compression ratio = stored values / pixels)
+    """
+    image = np.asarray(image, dtype=float)
+    if image.ndim == 3:
+        channels = [low_rank_approximation(image[..., c], k, method) for c in range(image.shape[-1])]
+        return np.stack([c[0] for c in channels], axis=-1), channels[0][1]
+    
+    U, S, Vt = truncated_svd(image, k, method)
+    compressed = (U * S) @ Vt
+    ratio = (U.size + S.size + Vt.size) / image.size
+    return compressed, ratio
+
+
+def _chunks(X: np.ndarray, rows: int = _CHUNK_ROWS):
+    for start in range(0, len(X), rows):
+        yield X[start:start + rows]
+
+
+def _column_blocks(X: np.ndarray, mean: np.ndarray, values: int = _CHUNK_ROWS * 100):
+    """Centered float blocks of columns, about ``values`` entries each."""
+    width = max(1, values // max(1, len(X)))
+    for start in range(0, X.shape[1], width):
+        cols = slice(start, start + width)
+        yield cols, np.asarray(X[:, cols], dtype=float) - mean[cols]
+
+
+def _centered_randomized_svd(X: np.ndarray, mean: np.ndarray, k: int, n_oversamples: int = 10,
+                             n_iter: int = 4, seed: Optional[int] = None):
+    """
+    randomized_svd of X - mean without building the centered matrix.
+    
+    Every product with the centered data runs over row chunks, so only one
+    chunk is centered (and converted to float) at a time.
+    """
+    rng = np.random.default_rng(seed)
+    n, d = X.shape
+    rank = min(k + n_oversamples, n, d)
+    
+    def times(W):  # (X - mean) @ W, (n, r)
+        return np.vstack([(np.asarray(c, dtype=float) - mean) @ W for c in _chunks(X)])
+    
+    def transposed_times(Q):  # (X - mean).T @ Q, (d, r)
+        result = np.zeros((d, Q.shape[1]))
+        for start, chunk in zip(range(0, n, _CHUNK_ROWS), _chunks(X)):
+            result += (np.asarray(chunk, dtype=float) - mean).T @ Q[start:start + len(chunk)]
+        return result
+    
+    Q = np.linalg.qr(times(rng.standard_normal((d, rank))))[0]
+    for _ in range(n_iter):
+        Q = np.linalg.qr(transposed_times(Q))[0]
+        Q = np.linalg.qr(times(Q))[0]
+    
+    U_small, S, Vt = np.linalg.svd(transposed_times(Q).T, full_matrices=False)
+    return (Q @ U_small)[:, :k], S[:k], Vt[:k]
+
+
+class PCA:
+    """
+    Principal component analysis with a memory-aware choice of method.
+    
+    - 'covariance': eigendecomposition of the (d, d) covariance matrix,
+      accumulated over row chunks
+    - 'gram': eigendecomposition of the (n, n) Gram matrix, for few samples
+      with many features, accumulated over column blocks
+    - 'randomized': randomized SVD of the centered data, for a few
+      components of large data when neither matrix fits in memory; its
+      products with the data run over row chunks
+      
+    No method centers X as a whole copy, so X may be a memory-mapped array
+    (e.g. the cache of DatasetLoader.iter_mnist_chunks): besides the
+    (d, d) or (n, n) matrix, memory holds one chunk at a time.
+      
+    With method='auto' the smaller of the two matrices is used if it fits
+    in ``max_memory_mb``, otherwise the randomized method.
+    """
+    
+    def __init__(self, n_components: int, method: str = "auto",
+                 max_memory_mb: float = 256, seed: Optional[int] = None):
+        """
+        Initialize PCA.
+        
+        Args:
+            n_components: Number of principal components
+            method: 'auto', 'covariance', 'gram' or 'randomized'
+            max_memory_mb: Largest covariance/Gram matrix 'auto' may build
+            seed: Random seed for the randomized method
+        """
+        self.n_components = n_components
+        self.method = method
+        self.max_memory_mb = max_memory_mb
+        self.seed = seed
+    
+    def _choose_method(self, n: int, d: int) -> str:
+        if self.method != "auto":
+            return self.method
+        smaller = min(n, d)
+        if smaller ** 2 * 8 / 1e6 <= self.max_memory_mb:
+            return "covariance" if d <= n else "gram"
+        return "randomized"
+    
+    def fit(self, X: np.ndarray) -> "PCA":
+        """
+        Compute the principal components of X.
+        
+        Args:
+            X: Data (n_samples, n_features)
+            
+        Returns:
+            self, with 'components' (k, d), 'explained_variance',
+            'explained_variance_ratio', 'mean' and 'method_used'
+        """
+        X = np.asarray(X)
+        n, d = X.shape
+        k = self.n_components
+        self.method_used = self._choose_method(n, d)
+        self.mean = X.mean(axis=0)
+        
+        if self.method_used == "covariance":
+            scatter = np.zeros((d, d))
+            for chunk in _chunks(X):
+                chunk = np.asarray(chunk, dtype=float)
+                scatter += chunk.T @ chunk
+            cov = (scatter - n * np.outer(self.mean, self.mean)) / (n - 1)
+            eigenvalues, eigenvectors = np.linalg.eigh(cov)
+            order = np.argsort(eigenvalues)[::-1][:k]
+            self.components = eigenvectors[:, order].T
+            self.explained_variance = eigenvalues[order]
+            total_variance = np.trace(cov)
+        elif self.method_used == "gram":
+            gram = np.zeros((n, n))
+            for _, block in _column_blocks(X, self.mean):
+                gram += block @ block.T
+            eigenvalues, eigenvectors = np.linalg.eigh(gram)
+            order = np.argsort(eigenvalues)[::-1][:k]
+            # Right singular vectors from left ones: v = Xc^T u / sigma
+            singular = np.sqrt(np.maximum(eigenvalues[order], 0))
+            scaled = eigenvectors[:, order] / np.where(singular > 0, singular, 1)
+            self.components = np.empty((len(order), d))
+            for cols, block in _column_blocks(X, self.mean):
+                self.components[:, cols] = (block.T @ scaled).T
+            self.explained_variance = eigenvalues[order] / (n - 1)
+            total_variance = np.trace(gram) / (n - 1)
+        elif self.method_used == "randomized":
+            _, S, Vt = _centered_randomized_svd(X, self.mean, k, seed=self.seed)
+            self.components = Vt
+            self.explained_variance = S ** 2 / (n - 1)
+            total_variance = sum(((np.asarray(c, dtype=float) - self.mean) ** 2).sum() for c in _chunks(X)) / (n - 1)
+        else:
+            raise ValueError(f"Unknown PCA method: {self.method_used}")
+        
+        self.explained_variance_ratio = self.explained_variance / total_variance
+        return self
+    
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """Project data onto the principal components: (n, d) -> (n, k)."""
+        return (np.asarray(X) - self.mean) @ self.components.T
+    
+    def fit_transform(self, X: np.ndarray) -> np.ndarray:
+        return self.fit(X).transform(X)
+    
+    def inverse_transform(self, Z: np.ndarray) -> np.ndarray:
+        """Map projected data back to the original space: (n, k) -> (n, d)."""
+        return np.asarray(Z) @ self.components + self.mean
+
+
+class IncrementalPCA(PCA):
+    """
+    PCA over chunks that are never in memory at the same time.
+    
+    Each chunk is merged into the current components with one decomposition
+    of a (k + chunk rows + 1, d) block (Ross et al., 2008), so memory is
+    bounded by the chunk size whatever the dataset size.
+    
+    Example:
+        loader = DatasetLoader()
+        ipca = IncrementalPCA(50).fit(X for X, _ in loader.iter_mnist_chunks(10000))
+    """
+    
+    def __init__(self, n_components: int):
+        """
+        Initialize incremental PCA.
+        
+        Args:
+            n_components: Number of principal components
+        """
+        super().__init__(n_components, method="incremental")
+        self.method_used = "incremental"
+        self.n_samples_seen = 0
+        self.mean = None
+        self._singular_values = None
+        self._squared_deviations = None
+    
+    def partial_fit(self, chunk: np.ndarray) -> "IncrementalPCA":
+        """
+        Update the components with one chunk of samples.
+        
+        Args:
+            chunk: Data (m, n_features); the first chunk needs at least n_components rows
+            
+        Returns:
+            self
+        """
+        chunk = np.asarray(chunk, dtype=float)
+        m = len(chunk)
+        chunk_mean = chunk.mean(axis=0)
+        chunk_deviations = ((chunk - chunk_mean) ** 2).sum(axis=0)
+        
+        if self.n_samples_seen == 0:
+            stacked = chunk - chunk_mean
+            self.mean = chunk_mean
+            self._squared_deviations = chunk_deviations
+        else:
+            n = self.n_samples_seen
+            total = n + m
+            shift = self.mean - chunk_mean
+            stacked = np.vstack([
+                self._singular_values[:, None] * self.components,
+                chunk - chunk_mean,
+                np.sqrt(n * m / total) * shift,
+            ])
+            self.mean = (n * self.mean + m * chunk_mean) / total
+            self._squared_deviations = self._squared_deviations + chunk_deviations + shift ** 2 * n * m / total
+        
+        self.n_samples_seen += m
+        if len(stacked) > stacked.shape[1]:
+            # Tall block: the (d, d) eigenproblem is far cheaper than its SVD
+            eigenvalues, eigenvectors = np.linalg.eigh(stacked.T @ stacked)
+            order = np.argsort(eigenvalues)[::-1]
+            S, Vt = np.sqrt(np.maximum(eigenvalues[order], 0)), eigenvectors[:, order].T
+        else:
+            _, S, Vt = np.linalg.svd(stacked, full_matrices=False)
+        k = self.n_components
+        self._singular_values, self.components = S[:k], Vt[:k]
+        
+        self.explained_variance = S[:k] ** 2 / max(self.n_samples_seen - 1, 1)
+        self.explained_variance_ratio = S[:k] ** 2 / self._squared_deviations.sum()
+        return self
+    
+    def fit(self, chunks: Iterable[np.ndarray]) -> "IncrementalPCA":
+        """
+        Fit on an iterable of chunks (or a whole array, split into row chunks).
+        
+        Any earlier fit is discarded.
+        
+        Args:
+            chunks: Iterable of (m, n_features) arrays, or one (n, n_features) array
+            
+        Returns:
+            self
+        """
+        # Start over; partial_fit is the way to keep adding to a fit
+        self.n_samples_seen = 0
+        self.mean = None
+        self._singular_values = None
+        self._squared_deviations = None
+        
+        if isinstance(chunks, np.ndarray):
+            chunks = _chunks(chunks)
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        return self
@@ -3,14 +3,21 @@ Notebook conversion utilities
 Export Jupyter notebooks to PDF, Python scripts, and HTML
 """
 
+import asyncio
 import json
 import os
 import subprocess
+import time
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Union, Iterable
 import nbformat
 from nbconvert import PDFExporter, PythonExporter, HTMLExporter
 from nbconvert.preprocessors import ExecutePreprocessor
+from nbclient import NotebookClient
+
+from .incremental_executor import IncrementalExecutor
+from .notebook_reader import NotebookReader
+from .notebook_watcher import NotebookWatcher
 
 
 class NotebookConverter:
@@ -18,12 +25,14 @@ class NotebookConverter:
     Convert Jupyter notebooks to various formats.
     """
     
-    def __init__(self, base_path: str = "."):
+    def __init__(self, base_path: str = ".", fast_read: bool = False):
         """
         Initialize converter.
         
         Args:
             base_path: Base directory for the learning platform
+            fast_read: Read notebooks with NotebookReader (cached validation,
+                outputs skipped when the export does not use them)
         """
         self.base_path = Path(base_path)
         self.exports_dir = self.base_path / "exports"
@@ -33,10 +42,17 @@ class NotebookConverter:
         (self.exports_dir / "pdf").mkdir(exist_ok=True)
         (self.exports_dir / "scripts").mkdir(exist_ok=True)
         (self.exports_dir / "html").mkdir(exist_ok=True)
+        
+        self.reader = None
+        self.incremental_executor = None
+        if fast_read:
+            self.reader = NotebookReader(cache_dir=self.exports_dir / ".cache" / "validated")
     
     def export_notebook(self, notebook_path: str, 
                        format: str = "pdf",
-                       execute: bool = False) -> str:
+                       execute: bool = False,
+                       incremental: bool = False,
+                       output_name: Optional[str] = None) -> str:
         """
         Export a notebook to specified format.
         
@@ -44,7 +60,11 @@ class NotebookConverter:
             notebook_path: Path to .ipynb file
             format: 'pdf', 'py', or 'html'
             execute: Whether to execute notebook before export
-            
+            incremental: With execute, rerun only edited cells and their
+                dependents, reusing cached outputs for the rest
+            output_name: Output path relative to the format directory, without
+                extension (default: the notebook name)
+                
         Returns:
             Path to exported file
         """
@@ -54,25 +74,61 @@ class NotebookConverter:
             raise FileNotFoundError(f"Notebook not found: {notebook_path}")
         
         # Read notebook
-        with open(notebook_path, 'r', encoding='utf-8') as f:
-            nb = nbformat.read(f, as_version=4)
+        nb = self._read_notebook(notebook_path, self._needs_outputs(format, execute))
         
         # Execute if requested
-        if execute:
+        if execute and incremental:
+            self._get_incremental_executor().execute(nb, notebook_path)
+        elif execute:
             ep = ExecutePreprocessor(timeout=600, kernel_name='python3')
             ep.preprocess(nb, {'metadata': {'path': notebook_path.parent}})
         
-        # Export based on format
+        return self._export_nb(nb, notebook_path, format, output_name)
+    
+    def _get_incremental_executor(self) -> IncrementalExecutor:
+        """Create the incremental executor on first use (it owns live kernels)."""
+        if self.incremental_executor is None:
+            self.incremental_executor = IncrementalExecutor(
+                cache_dir=self.exports_dir / ".cache" / "execution",
+                kernel_name='python3',
+                timeout=600
+            )
+        return self.incremental_executor
+    
+    def _read_notebook(self, notebook_path: Path, outputs: bool = True):
+        """Read a notebook from disk as nbformat v4."""
+        if self.reader is not None:
+            return self.reader.read(notebook_path, outputs=outputs)
+        
+        with open(notebook_path, 'r', encoding='utf-8') as f:
+            return nbformat.read(f, as_version=4)
+    
+    @staticmethod
+    def _needs_outputs(format: str, execute: bool) -> bool:
+        """Whether stored outputs end up in the export."""
+        # Execution replaces outputs and Python scripts never contain them
+        return not execute and format not in ("py", "python")
+    
+    def _export_nb(self, nb, notebook_path: Path, format: str,
+                   output_name: Optional[str] = None) -> str:
+        """Export an already loaded notebook to the requested format."""
         if format == "pdf":
-            return self._export_pdf(nb, notebook_path)
+            return self._export_pdf(nb, notebook_path, output_name)
         elif format == "py" or format == "python":
-            return self._export_python(nb, notebook_path)
+            return self._export_python(nb, notebook_path, output_name)
         elif format == "html":
-            return self._export_html(nb, notebook_path)
+            return self._export_html(nb, notebook_path, output_name)
         else:
             raise ValueError(f"Unsupported format: {format}")
     
-    def _export_pdf(self, nb, notebook_path: Path) -> str:
+    def _output_path(self, subdir: str, notebook_path: Path, suffix: str,
+                     output_name: Optional[str] = None) -> Path:
+        """Path of an export file, creating subdirectories of output_name."""
+        output_path = self.exports_dir / subdir / f"{output_name or notebook_path.stem}{suffix}"
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        return output_path
+    
+    def _export_pdf(self, nb, notebook_path: Path, output_name: Optional[str] = None) -> str:
         """Export notebook to PDF."""
         pdf_exporter = PDFExporter()
         pdf_exporter.exclude_input_prompt = True
@@ -81,14 +137,14 @@ class NotebookConverter:
         pdf_data, resources = pdf_exporter.from_notebook_node(nb)
         
         # Create output path
-        output_path = self.exports_dir / "pdf" / f"{notebook_path.stem}.pdf"
+        output_path = self._output_path("pdf", notebook_path, ".pdf", output_name)
         
         with open(output_path, 'wb') as f:
             f.write(pdf_data)
         
         return str(output_path)
     
-    def _export_python(self, nb, notebook_path: Path) -> str:
+    def _export_python(self, nb, notebook_path: Path, output_name: Optional[str] = None) -> str:
         """Export notebook to Python script."""
         py_exporter = PythonExporter()
         py_exporter.exclude_markdown = False
@@ -96,14 +152,14 @@ class NotebookConverter:
         py_data, resources = py_exporter.from_notebook_node(nb)
         
         # Create output path
-        output_path = self.exports_dir / "scripts" / f"{notebook_path.stem}.py"
+        output_path = self._output_path("scripts", notebook_path, ".py", output_name)
         
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(py_data)
         
         return str(output_path)
     
-    def _export_html(self, nb, notebook_path: Path) -> str:
+    def _export_html(self, nb, notebook_path: Path, output_name: Optional[str] = None) -> str:
         """Export notebook to HTML."""
         html_exporter = HTMLExporter()
         html_exporter.exclude_input_prompt = True
@@ -112,7 +168,7 @@ class NotebookConverter:
         html_data, resources = html_exporter.from_notebook_node(nb)
         
         # Create output path
-        output_path = self.exports_dir / "html" / f"{notebook_path.stem}.html"
+        output_path = self._output_path("html", notebook_path, ".html", output_name)
         
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(html_data)
@@ -149,6 +205,193 @@ class NotebookConverter:
         
         return exported_files
     
+    def _collect_notebooks(self, notebooks: Union[str, Path, Iterable]) -> List[Path]:
+        """Expand a directory or an iterable of paths into notebook paths."""
+        if isinstance(notebooks, (str, Path)):
+            path = Path(notebooks)
+            if path.is_dir():
+                return sorted(path.rglob("*.ipynb"))
+            return [path]
+        return [Path(p) for p in notebooks]
+    
+    async def _export_async(self, notebook_path: Path, format: str,
+                            execute: bool, cell_timeout: Optional[int]) -> str:
+        """Read, optionally execute and export one notebook without blocking the loop."""
+        if not notebook_path.exists():
+            raise FileNotFoundError(f"Notebook not found: {notebook_path}")
+        
+        nb = await asyncio.to_thread(
+            self._read_notebook, notebook_path, self._needs_outputs(format, execute)
+        )
+        
+        if execute:
+            # The kernel is shut down by nbclient if this coroutine is cancelled
+            client = NotebookClient(
+                nb,
+                timeout=cell_timeout,
+                kernel_name='python3',
+                resources={'metadata': {'path': notebook_path.parent}}
+            )
+            await client.async_execute()
+        
+        return await asyncio.to_thread(self._export_nb, nb, notebook_path, format)
+    
+    async def _export_one_async(self, notebook_path: Path, format: str,
+                                execute: bool, notebook_timeout: Optional[float],
+                                cell_timeout: Optional[int],
+                                semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """Export one notebook under the concurrency limit and describe the outcome."""
+        result = {
+            "notebook": str(notebook_path),
+            "status": "ok",
+            "output_path": None,
+            "error": None,
+            "duration_seconds": 0.0
+        }
+        
+        async with semaphore:
+            start = time.perf_counter()
+            job = asyncio.ensure_future(
+                self._export_async(notebook_path, format, execute, cell_timeout)
+            )
+            try:
+                done, _ = await asyncio.wait({job}, timeout=notebook_timeout)
+            finally:
+                # Timed out, or this task itself was cancelled: stop the kernel
+                if not job.done():
+                    job.cancel()
+                    await asyncio.gather(job, return_exceptions=True)
+            
+            result["duration_seconds"] = round(time.perf_counter() - start, 3)
+            if not done:
+                result["status"] = "timeout"
+                result["error"] = f"Exceeded notebook timeout of {notebook_timeout}s"
+            elif job.exception() is not None:
+                e = job.exception()
+                result["status"] = "failed"
+                result["error"] = f"{type(e).__name__}: {e}"
+            else:
+                result["output_path"] = job.result()
+        
+        return result
+    
+    async def batch_export_async(self, notebooks: Union[str, Path, Iterable],
+                                 format: str = "pdf",
+                                 execute: bool = True,
+                                 max_concurrency: int = 4,
+                                 notebook_timeout: Optional[float] = None,
+                                 cell_timeout: Optional[int] = 600,
+                                 continue_on_failure: bool = True) -> List[Dict[str, Any]]:
+        """
+        Execute and export many notebooks concurrently.
+        
+        Each notebook gets its own kernel; at most ``max_concurrency`` run at
+        once. Cancelling the awaiting task shuts down every running kernel.
+        
+        Args:
+            notebooks: Directory to search recursively, or iterable of notebook paths
+            format: Export format
+            execute: Whether to execute notebooks before export
+            max_concurrency: Maximum number of notebooks processed at the same time
+            notebook_timeout: Wall-clock limit in seconds per notebook (None = no limit)
+            cell_timeout: Execution limit in seconds per cell (None = no limit)
+            continue_on_failure: If False, cancel remaining notebooks after the first failure
+            
+        Returns:
+            One result dict per notebook, in input order, with keys 'notebook',
+            'status' ('ok', 'failed', 'timeout' or 'cancelled'), 'output_path',
+            'error' and 'duration_seconds'
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        
+        paths = self._collect_notebooks(notebooks)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        tasks = [
+            asyncio.create_task(self._export_one_async(
+                path, format, execute, notebook_timeout, cell_timeout, semaphore
+            ))
+            for path in paths
+        ]
+        
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if not continue_on_failure and any(t.result()["status"] != "ok" for t in done):
+                    break
+        finally:
+            # Reached on early stop and on external cancellation alike
+            unfinished = {task for task in tasks if not task.done()}
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+        
+        results = []
+        for path, task in zip(paths, tasks):
+            if task in unfinished:
+                results.append({
+                    "notebook": str(path),
+                    "status": "cancelled",
+                    "output_path": None,
+                    "error": None,
+                    "duration_seconds": 0.0
+                })
+            else:
+                results.append(task.result())
+        
+        return results
+    
+    def batch_export_concurrent(self, notebooks: Union[str, Path, Iterable],
+                                format: str = "pdf",
+                                execute: bool = True,
+                                **kwargs) -> List[Dict[str, Any]]:
+        """
+        Blocking wrapper around batch_export_async for scripts and build jobs.
+        
+        Inside Jupyter, where an event loop is already running, use
+        ``await converter.batch_export_async(...)`` instead.
+        
+        Args:
+            notebooks: Directory or iterable of notebook paths
+            format: Export format
+            execute: Whether to execute notebooks before export
+            **kwargs: Passed through to batch_export_async
+            
+        Returns:
+            List of per-notebook result dicts
+        """
+        return asyncio.run(self.batch_export_async(notebooks, format, execute, **kwargs))
+    
+    def watch(self, dirs: Optional[List[str]] = None,
+              formats: Union[str, List[str]] = "html",
+              debounce: float = 0.5,
+              execute: bool = False,
+              **kwargs) -> NotebookWatcher:
+        """
+        Re-export notebooks in the background whenever they are saved.
+        
+        Uses inotify on Linux and falls back to polling modification times
+        elsewhere. Only notebooks whose content changed are exported.
+        
+        Args:
+            dirs: Directories to watch (default: all module_* directories and book/)
+            formats: Export format or list of formats
+            debounce: Seconds a notebook must be quiet before it is exported
+            execute: Whether to execute notebooks before export
+            **kwargs: Passed through to NotebookWatcher
+            
+        Returns:
+            Running NotebookWatcher; call stop() to end watching
+        """
+        if dirs is None:
+            dirs = sorted(p for p in self.base_path.glob("module_*") if p.is_dir())
+            dirs.append(self.base_path / "book")
+        
+        watcher = NotebookWatcher(self, dirs, formats, debounce=debounce,
+                                  execute=execute, **kwargs)
+        return watcher.start()
+    
     def create_study_guide(self, module_dir: str) -> str:
         """
         Create a combined study guide PDF from all module notebooks.
@@ -180,8 +423,7 @@ class NotebookConverter:
         combined_nb.cells.append(title_cell)
         
         for nb_path in notebooks:
-            with open(nb_path, 'r', encoding='utf-8') as f:
-                nb = nbformat.read(f, as_version=4)
+            nb = self._read_notebook(nb_path)
             
             # Add section header
             section_cell = nbformat.v4.new_markdown_cell(
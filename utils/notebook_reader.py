@@ -0,0 +1,115 @@
+"""
+Fast notebook reading
+Opt-in replacement for nbformat.read that skips repeated schema validation
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional, Set
+
+import nbformat
+from nbformat.v4.rwbase import rejoin_lines, strip_transient
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
+
+def _loads(raw: bytes) -> dict:
+    """Parse notebook JSON with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class NotebookReader:
+    """
+    Read notebooks faster than ``nbformat.read`` for repeated exports.
+    
+    - JSON is parsed with orjson if it is installed
+    - Schema validation runs once per notebook content; the content hash
+      is remembered in memory and, optionally, in a cache directory
+    - Outputs can be dropped while parsing when the caller does not use them
+      (Python export, or notebooks that are executed before export)
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize reader.
+        
+        Args:
+            cache_dir: Directory for persistent validation markers (None = memory only)
+        """
+        self._validated: Set[str] = set()
+        self.cache_dir = None
+        if cache_dir is not None:
+            # Markers are only valid for the schema of the installed nbformat
+            self.cache_dir = Path(cache_dir) / f"nbformat-{nbformat.__version__}"
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def _is_validated(self, key: str) -> bool:
+        if key in self._validated:
+            return True
+        if self.cache_dir is not None and (self.cache_dir / key).exists():
+            self._validated.add(key)
+            return True
+        return False
+    
+    def _mark_validated(self, key: str):
+        self._validated.add(key)
+        if self.cache_dir is not None:
+            (self.cache_dir / key).touch()
+    
+    def read(self, notebook_path, outputs: bool = True):
+        """
+        Read a notebook as nbformat v4.
+        
+        Args:
+            notebook_path: Path to .ipynb file
+            outputs: Whether to keep cell outputs (False clears them)
+            
+        Returns:
+            NotebookNode
+        """
+        raw = Path(notebook_path).read_bytes()
+        try:
+            data = _loads(raw)
+        except ValueError:
+            data = {}
+        
+        if not isinstance(data, dict) or data.get("nbformat") != 4:
+            # Older formats need conversion and broken files should raise
+            # nbformat's usual errors, so use the regular path
+            nb = nbformat.reads(raw.decode('utf-8'), as_version=4)
+            if not outputs:
+                self._strip_outputs(nb)
+            return nb
+        
+        if not outputs:
+            # Drop outputs before building NotebookNodes and validating them
+            self._strip_outputs(data)
+        
+        key = hashlib.sha256(raw).hexdigest() + ("" if outputs else "-no-outputs")
+        # Same normalisation nbformat applies after parsing v4 JSON
+        nb = strip_transient(rejoin_lines(nbformat.from_dict(data)))
+        
+        if not self._is_validated(key):
+            try:
+                nbformat.validate(nb)
+            except nbformat.ValidationError:
+                # Let nbformat repair (e.g. missing cell ids) or raise as usual
+                nb = nbformat.reads(raw.decode('utf-8'), as_version=4)
+                if not outputs:
+                    self._strip_outputs(nb)
+                return nb
+            self._mark_validated(key)
+        
+        return nb
+    
+    @staticmethod
+    def _strip_outputs(nb):
+        for cell in nb["cells"]:
+            if cell.get("cell_type") == "code":
+                cell["outputs"] = []
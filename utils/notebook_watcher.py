@@ -0,0 +1,299 @@
+"""
+Notebook watch mode
+Re-export notebooks in the background whenever they are saved
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Iterable, Callable
+
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+EVENT_HEADER = struct.Struct("iIII")
+
+# Directories that never contain source notebooks
+IGNORED_DIRS = {".ipynb_checkpoints", "_build", "__pycache__", ".git"}
+
+
+class _InotifySource:
+    """Recursive directory watcher built on Linux inotify via ctypes."""
+    
+    def __init__(self, dirs: List[Path]):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        
+        self._watches: Dict[int, Path] = {}
+        for directory in dirs:
+            self._add_tree(directory)
+    
+    def _add_tree(self, root: Path):
+        """Watch a directory and every subdirectory below it."""
+        for current, subdirs, _ in os.walk(root):
+            subdirs[:] = [d for d in subdirs if d not in IGNORED_DIRS]
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(current), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {current}")
+            self._watches[wd] = Path(current)
+    
+    def poll(self, timeout: float) -> Optional[List[Path]]:
+        """
+        Wait up to ``timeout`` seconds and return notebooks that were written.
+        
+        Returns None if the kernel queue overflowed and a rescan is needed.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        
+        changed = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b"\0").decode(sys.getfilesystemencoding())
+            offset += name_len
+            
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+            
+            path = directory / name
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and name not in IGNORED_DIRS:
+                    self._add_tree(path)
+                    changed.extend(_find_notebooks([path]))
+            elif path.suffix == ".ipynb" and mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                changed.append(path)
+        
+        return changed
+    
+    def close(self):
+        """Release the inotify file descriptor."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class _PollingSource:
+    """Portable fallback that compares file modification times."""
+    
+    def __init__(self, dirs: List[Path], interval: float):
+        self.dirs = dirs
+        self.interval = interval
+        self._snapshot = self._scan()
+    
+    def _scan(self) -> Dict[Path, tuple]:
+        snapshot = {}
+        for path in _find_notebooks(self.dirs):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+    
+    def poll(self, timeout: float) -> List[Path]:
+        """Sleep for the polling interval and return notebooks that changed."""
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        changed = [p for p, sig in current.items() if self._snapshot.get(p) != sig]
+        self._snapshot = current
+        return changed
+    
+    def close(self):
+        pass
+
+
+def _find_notebooks(dirs: Iterable[Path]) -> List[Path]:
+    """List notebooks below the given directories, skipping checkpoints and builds."""
+    notebooks = []
+    for root in dirs:
+        for current, subdirs, files in os.walk(root):
+            subdirs[:] = [d for d in subdirs if d not in IGNORED_DIRS]
+            notebooks.extend(Path(current) / f for f in files if f.endswith(".ipynb"))
+    return notebooks
+
+
+class NotebookWatcher:
+    """
+    Watch notebook directories and re-export notebooks when they change.
+    
+    Saves are debounced: a notebook is exported once it has been quiet for
+    ``debounce`` seconds, so a burst of autosaves triggers a single export.
+    Notebooks whose content is unchanged since their last export are skipped.
+    """
+    
+    def __init__(self, converter, dirs: Iterable, formats: Iterable[str] = ("html",),
+                 debounce: float = 0.5,
+                 poll_interval: float = 1.0,
+                 execute: bool = False,
+                 use_inotify: Optional[bool] = None,
+                 on_export: Optional[Callable[[Path, str, Optional[str], Optional[Exception]], None]] = None):
+        """
+        Initialize watcher.
+        
+        Args:
+            converter: NotebookConverter used for the exports
+            dirs: Directories to watch recursively
+            formats: Export formats to produce for every changed notebook
+            debounce: Quiet period in seconds before a changed notebook is exported
+            poll_interval: Scan interval in seconds for the polling fallback
+            execute: Whether to execute notebooks before export
+            use_inotify: Force (True) or disable (False) inotify; None = auto-detect
+            on_export: Optional callback(notebook, format, output_path, error)
+        """
+        self.converter = converter
+        self.dirs = [Path(d) for d in dirs if Path(d).is_dir()]
+        self.formats = [formats] if isinstance(formats, str) else list(formats)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.execute = execute
+        self.on_export = on_export
+        
+        if use_inotify is None:
+            use_inotify = sys.platform.startswith("linux")
+        self.use_inotify = use_inotify
+        
+        self._source = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._pending: Dict[Path, float] = {}
+        self._exported_hashes: Dict[Path, str] = {}
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the background thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def backend(self) -> str:
+        """Name of the change detection backend in use."""
+        return "inotify" if isinstance(self._source, _InotifySource) else "polling"
+    
+    def _make_source(self):
+        if self.use_inotify:
+            try:
+                return _InotifySource(self.dirs)
+            except (OSError, AttributeError):
+                # No inotify (non-Linux libc, watch limit reached, ...)
+                pass
+        return _PollingSource(self.dirs, self.poll_interval)
+    
+    def start(self) -> "NotebookWatcher":
+        """Start watching in a background thread."""
+        if self.is_running:
+            return self
+        
+        # Remember current contents so unchanged notebooks are not re-exported
+        for path in _find_notebooks(self.dirs):
+            self._exported_hashes[path] = self._content_hash(path)
+        
+        self._source = self._make_source()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="NotebookWatcher", daemon=True)
+        self._thread.start()
+        print(f"👀 Watching {len(self.dirs)} directories ({self.backend})")
+        return self
+    
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the background thread and release resources."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+    
+    def _run(self):
+        while not self._stop_event.is_set():
+            wait = self.debounce if self._pending else self.poll_interval
+            changed = self._source.poll(wait)
+            
+            if changed is None:
+                # Event queue overflowed, fall back to a full comparison
+                changed = _find_notebooks(self.dirs)
+            
+            now = time.monotonic()
+            for path in changed:
+                self._pending[path] = now
+            
+            ready = [p for p, t in self._pending.items() if now - t >= self.debounce]
+            for path in ready:
+                del self._pending[path]
+                if self._stop_event.is_set():
+                    break
+                self._export_changed(path)
+    
+    def _content_hash(self, path: Path) -> Optional[str]:
+        try:
+            return hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            return None
+    
+    def _export_changed(self, path: Path):
+        """Export one notebook to every format if its content changed."""
+        digest = self._content_hash(path)
+        if digest is None or self._exported_hashes.get(path) == digest:
+            return
+        
+        failed = False
+        for format in self.formats:
+            output_path, error = None, None
+            try:
+                output_path = self.converter.export_notebook(path, format, self.execute)
+                print(f"✓ Re-exported: {path.name} → {output_path}")
+            except Exception as e:
+                error = e
+                failed = True
+                print(f"✗ Failed to re-export {path.name}: {e}")
+            
+            if self.on_export is not None:
+                try:
+                    self.on_export(path, format, output_path, error)
+                except Exception as e:
+                    # A broken callback must not end the watcher thread
+                    print(f"✗ on_export callback failed for {path.name}: {type(e).__name__}: {e}")
+        
+        # Only a complete export counts; after a failure the next save retries,
+        # even if the content is unchanged
+        if not failed:
+            self._exported_hashes[path] = digest
@@ -0,0 +1,148 @@
+"""
+Optimization utilities
+Vectorized numerical gradients and batched gradient descent experiments
+"""
+
+from typing import Callable, Dict, Optional, Any, Union
+
+import numpy as np
+
+
+ArrayLike = Union[float, np.ndarray, list]
+
+
+def numerical_derivative(f: Callable, x: ArrayLike, h: float = 1e-5) -> np.ndarray:
+    """
+    Central-difference derivative of a scalar function at one or many points.
+    
+    f'(x) ≈ (f(x+h) - f(x-h)) / (2h), with ``f`` evaluated on whole arrays.
+    
+    Args:
+        f: Vectorized function of x
+        x: Point or array of points
+        h: Step size
+        
+    Returns:
+        Derivatives with the shape of x
+    """
+    x = np.asarray(x, dtype=float)
+    return (f(x + h) - f(x - h)) / (2 * h)
+
+
+def numerical_gradient(f: Callable, points: ArrayLike, h: float = 1e-5) -> np.ndarray:
+    """
+    Central-difference gradients at many points with a single call of ``f``.
+    
+    The 2*d shifted copies of every point are stacked into one array, so
+    ``f`` runs once on all of them instead of once per point and coordinate.
+    
+    Example:
+        f_2d = lambda p: p[..., 0] ** 2 + p[..., 1] ** 2
+        numerical_gradient(f_2d, [[3.0, 3.0], [1.0, -2.0]])  # [[6, 6], [2, -4]]
+        
+    Args:
+        f: Function of points whose last axis holds the d coordinates,
+            returning one value per point
+        points: Array (..., d) of points
+        h: Step size
+        
+    Returns:
+        Array (..., d) of gradients
+    """
+    points = np.asarray(points, dtype=float)
+    d = points.shape[-1]
+    offsets = h * np.eye(d)
+    # (..., 2, d, d): [+h, -h] x (coordinate shifted) x coordinates
+    shifted = points[..., None, None, :] + np.stack([offsets, -offsets])
+    values = f(shifted)
+    return (values[..., 0, :] - values[..., 1, :]) / (2 * h)
+
+
+def gradient_descent_batch(f: Callable, starts: ArrayLike, learning_rates: ArrayLike,
+                           n_iterations: int = 100,
+                           tolerance: Optional[float] = 1e-6,
+                           gradient: Optional[Callable] = None,
+                           h: float = 1e-5) -> Dict[str, Any]:
+    """
+    Run gradient descent for every learning rate and start point at once.
+    
+    All trajectories advance together as array operations: one gradient
+    evaluation per iteration covers the whole grid of learning rates x
+    start points. Trajectories that converge (step below ``tolerance``) or
+    diverge (non-finite values) stop moving; their last position is
+    repeated to the end of the history.
+    
+    Example:
+        f = lambda x: (x - 3) ** 2 + 5
+        result = gradient_descent_batch(f, starts=[0.0, 6.0], learning_rates=[0.01, 0.1, 0.5, 1.1])
+        plot_gradient_descent_path(f, result["history"][2, 0], x_range=(-1, 7))
+        
+    Args:
+        f: Vectorized objective; for d > 1 it receives arrays (..., d)
+        starts: Start points, shape (S,) for 1D functions or (S, d)
+        learning_rates: Learning rates, shape (L,)
+        n_iterations: Maximum iterations
+        tolerance: Stop a trajectory once its step is smaller (None: never stop)
+        gradient: Analytical gradient with the calling convention of f
+            (default: central differences, see numerical_gradient)
+        h: Step size of the numerical gradient
+        
+    Returns:
+        Dict with 'history' (L, S, n_iterations + 1[, d]) positions,
+        'x' final positions (L, S[, d]), 'values' f at the final positions,
+        'iterations' (L, S) steps taken, 'converged' and 'diverged' (L, S) flags
+    """
+    starts = np.asarray(starts, dtype=float)
+    learning_rates = np.asarray(learning_rates, dtype=float).reshape(-1)
+    scalar = starts.ndim == 1
+    points = starts[:, None] if scalar else starts
+    
+    if gradient is None:
+        objective = (lambda p: f(p[..., 0])) if scalar else f
+        grad = lambda p: numerical_gradient(objective, p, h)
+    elif scalar:
+        grad = lambda p: gradient(p[..., 0])[..., None]
+    else:
+        grad = gradient
+    
+    n_rates, (n_starts, d) = len(learning_rates), points.shape
+    history = np.empty((n_rates, n_starts, n_iterations + 1, d))
+    x = np.broadcast_to(points, (n_rates, n_starts, d)).copy()
+    history[:, :, 0] = x
+    
+    rates = learning_rates[:, None, None]
+    active = np.ones((n_rates, n_starts), dtype=bool)
+    iterations = np.zeros((n_rates, n_starts), dtype=int)
+    converged = np.zeros((n_rates, n_starts), dtype=bool)
+    diverged = np.zeros((n_rates, n_starts), dtype=bool)
+    
+    with np.errstate(over="ignore", invalid="ignore"):
+        for i in range(1, n_iterations + 1):
+            if not active.any():
+                history[:, :, i:] = x[:, :, None]
+                break
+            step = np.where(active[..., None], rates * grad(x), 0.0)
+            x = x - step
+            history[:, :, i] = x
+            
+            iterations += active
+            finite = np.isfinite(x).all(axis=-1)
+            diverged |= active & ~finite
+            if tolerance is not None:
+                converged |= active & finite & (np.abs(step).max(axis=-1) < tolerance)
+            active &= finite & ~converged
+    
+    values = f(x[..., 0]) if scalar else f(x)
+    if scalar:
+        history, x = history[..., 0], x[..., 0]
+    
+    return {
+        "history": history,
+        "x": x,
+        "values": values,
+        "iterations": iterations,
+        "converged": converged,
+        "diverged": diverged,
+        "learning_rates": learning_rates,
+        "starts": starts,
+    }
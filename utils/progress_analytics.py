@@ -0,0 +1,254 @@
+"""
+Progress analytics
+Flatten tracker state into columnar tables and compute cohort statistics
+"""
+
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .progress_tracker import ProgressTracker
+from .tracker_service import TrackerService
+
+
+TABLES = ("sessions", "daily_activity", "exercises", "skills", "modules")
+
+
+def _iter_learners(learners) -> Iterable[Tuple[str, ProgressTracker]]:
+    """Normalise the accepted learner collections to (user_id, tracker) pairs."""
+    if isinstance(learners, ProgressTracker):
+        yield "default", learners
+    elif isinstance(learners, TrackerService):
+        for user_id in learners.iter_user_ids():
+            yield user_id, learners.get(user_id)
+    elif isinstance(learners, dict):
+        yield from learners.items()
+    else:
+        yield from learners
+
+
+def cohort_tables(learners: Union[ProgressTracker, TrackerService, Dict[str, ProgressTracker],
+                                  Iterable[Tuple[str, ProgressTracker]]]) -> Dict[str, pd.DataFrame]:
+    """
+    Flatten the state of one or many learners into one table per record type.
+    
+    Records of all learners are collected column by column and turned into
+    a DataFrame once per table, so the cost is one pass over the nested
+    dicts instead of one DataFrame per learner.
+    
+    Args:
+        learners: A ProgressTracker, a TrackerService (every learner with
+            saved state), a dict of user id -> tracker, or (user id, tracker) pairs
+            
+    Returns:
+        Dict with DataFrames 'sessions', 'daily_activity', 'exercises',
+        'skills' and 'modules', each with a 'user_id' column
+    """
+    columns: Dict[str, Dict[str, List[Any]]] = {
+        "sessions": {c: [] for c in ("user_id", "id", "start_time", "end_time", "module",
+                                     "lesson", "duration_minutes", "completed")},
+        "daily_activity": {c: [] for c in ("user_id", "date", "total_time_minutes",
+                                           "sessions", "modules_visited")},
+        "exercises": {c: [] for c in ("user_id", "module", "exercise_id", "completed_at", "score")},
+        "skills": {c: [] for c in ("user_id", "skill", "level", "confidence", "exercises_completed")},
+        "modules": {c: [] for c in ("user_id", "module", "position", "completed", "progress_pct",
+                                    "lessons_completed", "exercises_completed", "time_spent_minutes")},
+    }
+    
+    def add(table, **values):
+        for name, column in columns[table].items():
+            column.append(values.get(name))
+    
+    for user_id, tracker in _iter_learners(learners):
+        progress = tracker.progress
+        
+        for session in tracker.iter_sessions():
+            add("sessions", user_id=user_id, **session)
+        
+        for day, activity in progress["daily_activity"].items():
+            add("daily_activity", user_id=user_id, date=day, **activity)
+        
+        for position, (module, data) in enumerate(progress["modules"].items()):
+            for exercise in data["exercises_completed"]:
+                add("exercises", user_id=user_id, module=module, exercise_id=exercise["id"],
+                    completed_at=exercise["completed_at"], score=exercise["score"])
+            add("modules", user_id=user_id, module=module, position=position,
+                completed=data["completed"], progress_pct=data["progress_pct"],
+                lessons_completed=len(data["lessons_completed"]),
+                exercises_completed=len(data["exercises_completed"]),
+                time_spent_minutes=data["time_spent_minutes"])
+        
+        for skill, data in progress["skills"].items():
+            add("skills", user_id=user_id, skill=skill, **data)
+    
+    tables = {name: pd.DataFrame(data) for name, data in columns.items()}
+    
+    # Typed columns so comparisons and resampling are vectorized
+    for table, column in (("sessions", "start_time"), ("sessions", "end_time"),
+                          ("daily_activity", "date"), ("exercises", "completed_at")):
+        tables[table][column] = pd.to_datetime(tables[table][column])
+    for table, column in (("sessions", "duration_minutes"), ("daily_activity", "total_time_minutes"),
+                          ("exercises", "score"), ("modules", "progress_pct"),
+                          ("modules", "time_spent_minutes")):
+        tables[table][column] = pd.to_numeric(tables[table][column]).astype(float)
+    tables["sessions"]["completed"] = tables["sessions"]["completed"].fillna(False).astype(bool)
+    tables["modules"]["completed"] = tables["modules"]["completed"].astype(bool)
+    
+    return tables
+
+
+def export_parquet(tables: Dict[str, pd.DataFrame], output_dir: str) -> Dict[str, str]:
+    """
+    Write tables as Parquet files (requires pyarrow).
+    
+    Args:
+        tables: Output of cohort_tables
+        output_dir: Directory for <table>.parquet files
+        
+    Returns:
+        Dict of table name -> file path
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    paths = {}
+    for name, table in tables.items():
+        path = output_dir / f"{name}.parquet"
+        table.to_parquet(path, index=False)
+        paths[name] = str(path)
+    
+    print(f"✓ Exported {len(paths)} tables to {output_dir}")
+    return paths
+
+
+def streak_stats(daily_activity: pd.DataFrame, as_of: Optional[date] = None) -> pd.DataFrame:
+    """
+    Longest and current study streak of every learner.
+    
+    Consecutive study days form a run; runs are found for all learners at
+    once from day-number differences, without a per-learner loop.
+    
+    Args:
+        daily_activity: The 'daily_activity' table
+        as_of: Day the current streak is measured at (default: today); a
+            streak still counts if the last study day was the day before
+            
+    Returns:
+        DataFrame indexed by user_id with 'longest_streak_days',
+        'current_streak_days' and 'study_days'
+    """
+    as_of = np.datetime64(as_of or datetime.now().date(), "D")
+    days = daily_activity[["user_id", "date"]].sort_values(["user_id", "date"])
+    users = days["user_id"].to_numpy()
+    day_numbers = days["date"].to_numpy().astype("datetime64[D]")
+    
+    # A run starts at a learner's first day or after a gap of more than one day
+    new_run = np.ones(len(days), dtype=bool)
+    new_run[1:] = (users[1:] != users[:-1]) | (np.diff(day_numbers).astype(int) != 1)
+    run_ids = np.cumsum(new_run)
+    run_lengths = np.bincount(run_ids)[run_ids]
+    
+    runs = pd.DataFrame({"user_id": users, "run_length": run_lengths, "day": day_numbers})
+    grouped = runs.groupby("user_id", sort=True)
+    last = grouped.tail(1).set_index("user_id")
+    
+    active = (as_of - last["day"].to_numpy().astype("datetime64[D]")).astype(int) <= 1
+    return pd.DataFrame({
+        "longest_streak_days": grouped["run_length"].max(),
+        "current_streak_days": np.where(active, last["run_length"], 0),
+        "study_days": grouped.size(),
+    })
+
+
+def module_time_percentiles(modules: pd.DataFrame,
+                            percentiles: Iterable[float] = (10, 25, 50, 75, 90)) -> pd.DataFrame:
+    """
+    Percentiles of time spent per module across learners who started it.
+    
+    Args:
+        modules: The 'modules' table
+        percentiles: Percentiles to compute (0-100)
+        
+    Returns:
+        DataFrame indexed by module with one column per percentile (minutes)
+    """
+    percentiles = list(percentiles)
+    # learners x modules matrix; modules a learner never spent time on are NaN
+    times = modules.pivot(index="user_id", columns="module", values="time_spent_minutes")
+    times = times.reindex(columns=_module_order(modules))
+    values = times.to_numpy(dtype=float, copy=True)
+    values[values <= 0] = np.nan
+    
+    result = np.full((len(percentiles), values.shape[1]), np.nan)
+    started = ~np.all(np.isnan(values), axis=0)
+    if started.any():
+        result[:, started] = np.nanpercentile(values[:, started], percentiles, axis=0)
+    
+    return pd.DataFrame(result.T, index=times.columns, columns=[f"p{p:g}" for p in percentiles])
+
+
+def completion_funnel(modules: pd.DataFrame) -> pd.DataFrame:
+    """
+    How many learners started, completed, and completed every module up to each one.
+    
+    Args:
+        modules: The 'modules' table
+        
+    Returns:
+        DataFrame indexed by module (curriculum order) with counts 'started',
+        'completed' and 'reached' (completed this and all earlier modules)
+        and 'reached_pct' of all learners
+    """
+    order = _module_order(modules)
+    completed = modules.pivot(index="user_id", columns="module", values="completed")
+    completed = completed.reindex(columns=order).fillna(False).to_numpy(dtype=bool)
+    
+    activity = modules.assign(
+        started=(modules["lessons_completed"] > 0) | (modules["exercises_completed"] > 0)
+        | (modules["time_spent_minutes"] > 0) | modules["completed"]
+    )
+    started = activity.pivot(index="user_id", columns="module", values="started")
+    started = started.reindex(columns=order).fillna(False).to_numpy(dtype=bool)
+    
+    reached = np.logical_and.accumulate(completed, axis=1)
+    learners = completed.shape[0]
+    
+    return pd.DataFrame({
+        "started": started.sum(axis=0),
+        "completed": completed.sum(axis=0),
+        "reached": reached.sum(axis=0),
+        "reached_pct": reached.sum(axis=0) / learners * 100 if learners else 0.0,
+    }, index=pd.Index(order, name="module"))
+
+
+def _module_order(modules: pd.DataFrame) -> List[str]:
+    """Modules in curriculum order (their position in the progress file)."""
+    return modules.groupby("module")["position"].min().sort_values().index.tolist()
+
+
+def cohort_report(learners, output_dir: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Flatten a cohort and compute all cohort statistics in one call.
+    
+    Args:
+        learners: Anything accepted by cohort_tables
+        output_dir: If given, also write every table as Parquet there
+        
+    Returns:
+        Dict with the flattened tables plus 'streaks', 'module_time' and 'funnel'
+    """
+    tables = cohort_tables(learners)
+    stats = {
+        "streaks": streak_stats(tables["daily_activity"]),
+        "module_time": module_time_percentiles(tables["modules"]),
+        "funnel": completion_funnel(tables["modules"]),
+    }
+    
+    if output_dir is not None:
+        export_parquet({**tables, **{name: df.reset_index() for name, df in stats.items()}},
+                       output_dir)
+    
+    return {**tables, **stats}
@@ -0,0 +1,176 @@
+"""
+Historical progress import
+Turn tables of past sessions, exercises and lessons into one tracker event
+"""
+
+from typing import Dict, List, Optional, Any, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+Table = Union[pd.DataFrame, List[Dict[str, Any]], None]
+
+
+def _table(rows: Table, required: Tuple[str, ...], name: str) -> pd.DataFrame:
+    """Accept a DataFrame or a list of dicts and check the required columns."""
+    df = rows.copy() if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows or []))
+    if df.empty:
+        return df
+    missing = [c for c in required if c not in df.columns]
+    if missing:
+        raise ValueError(f"{name} table is missing columns: {', '.join(missing)}")
+    return df
+
+
+def _check_modules(df: pd.DataFrame, progress: Dict[str, Any]):
+    unknown = set(df["module"].unique()) - set(progress["modules"])
+    if unknown:
+        raise ValueError(f"Unknown module: {sorted(unknown)[0]}")
+
+
+def _sessions(sessions: Table, first_id: int) -> Tuple[pd.DataFrame, List[Dict]]:
+    """Normalise sessions and build their session log records (in start order)."""
+    df = _table(sessions, ("module", "start_time"), "sessions")
+    if df.empty:
+        return df, []
+    
+    has_end, has_duration = "end_time" in df.columns, "duration_minutes" in df.columns
+    if not (has_end or has_duration):
+        raise ValueError("sessions table is missing columns: end_time or duration_minutes")
+    
+    start = pd.to_datetime(df["start_time"])
+    end = pd.to_datetime(df["end_time"]) if has_end else pd.Series(pd.NaT, index=df.index)
+    if has_duration:
+        end = end.fillna(start + pd.to_timedelta(df["duration_minutes"], unit="m"))
+    incomplete = df.index[end.isna()]
+    if len(incomplete):
+        raise ValueError(f"sessions rows {list(incomplete[:5])} have neither end_time nor duration_minutes")
+    duration = (end - start).dt.total_seconds() / 60
+    df["duration_minutes"] = df["duration_minutes"].fillna(duration) if has_duration else duration
+    
+    df = df.assign(start=start, end=end).sort_values("start", kind="stable").reset_index(drop=True)
+    df["duration_minutes"] = df["duration_minutes"].astype(float)
+    df["day"] = df["end"].dt.strftime("%Y-%m-%d")
+    
+    log = pd.DataFrame({
+        "id": [f"session_{n:04d}" for n in range(first_id, first_id + len(df))],
+        "start_time": df["start"].dt.strftime("%Y-%m-%dT%H:%M:%S"),
+        "module": df["module"],
+        "lesson": df["lesson"] if "lesson" in df.columns else "",
+        "notes": df["notes"] if "notes" in df.columns else "imported",
+        "end_time": df["end"].dt.strftime("%Y-%m-%dT%H:%M:%S"),
+        "duration_minutes": df["duration_minutes"].round(2),
+        "completed": df["completed"].astype(bool) if "completed" in df.columns else False,
+    })
+    return df, log.to_dict("records")
+
+
+def _daily_activity(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """Per-day totals in the shape of progress['daily_activity']."""
+    if df.empty:
+        return {}
+    by_day = df.groupby("day", sort=True)
+    totals = by_day["duration_minutes"].sum()
+    counts = by_day.size()
+    # Modules in the order they were first visited that day
+    modules = by_day["module"].unique()
+    return {
+        day: {"total_time_minutes": float(totals[day]), "sessions": int(counts[day]),
+              "modules_visited": list(modules[day])}
+        for day in totals.index
+    }
+
+
+def _streak(days: np.ndarray) -> Optional[Dict[str, Any]]:
+    """Current and longest streak over sorted unique study days (datetime64[D])."""
+    if len(days) == 0:
+        return None
+    # A run starts at the first day or after a gap of more than one day
+    new_run = np.ones(len(days), dtype=bool)
+    new_run[1:] = np.diff(days).astype(int) != 1
+    run_lengths = np.diff(np.append(np.flatnonzero(new_run), len(days)))
+    return {
+        "last_study_date": str(days[-1]),
+        "current_streak_days": int(run_lengths[-1]),
+        "longest_streak_days": int(run_lengths.max()),
+    }
+
+
+def _exercises(exercises: Table, progress: Dict[str, Any]) -> List[Dict]:
+    """New exercises (first completion only) in completion order."""
+    df = _table(exercises, ("module", "exercise_id", "completed_at"), "exercises")
+    if df.empty:
+        return []
+    _check_modules(df, progress)
+    
+    df["completed_at"] = pd.to_datetime(df["completed_at"])
+    df["score"] = df["score"].astype(float).fillna(1.0) if "score" in df.columns else 1.0
+    df["skill"] = df["skill"].where(df["skill"].notna(), None) if "skill" in df.columns else None
+    df["exercise_id"] = df["exercise_id"].astype(str)
+    
+    df = df.sort_values("completed_at", kind="stable").drop_duplicates(["module", "exercise_id"])
+    known = [f"{m}/{e['id']}" for m, d in progress["modules"].items() for e in d["exercises_completed"]]
+    df = df[~(df["module"] + "/" + df["exercise_id"]).isin(known)]
+    
+    df["completed_at"] = df["completed_at"].dt.strftime("%Y-%m-%dT%H:%M:%S")
+    return df[["module", "exercise_id", "completed_at", "score", "skill"]].to_dict("records")
+
+
+def _lessons(lessons: Table, progress: Dict[str, Any]) -> List[Dict]:
+    """New lessons with the XP they earned."""
+    df = _table(lessons, ("module", "lesson"), "lessons")
+    if df.empty:
+        return []
+    _check_modules(df, progress)
+    
+    if "completed_at" in df.columns:
+        df = df.sort_values("completed_at", kind="stable")
+    df["xp_earned"] = df["xp_earned"].fillna(0).astype(int) if "xp_earned" in df.columns else 0
+    df = df.drop_duplicates(["module", "lesson"])
+    known = [f"{m}/{lesson}" for m, d in progress["modules"].items() for lesson in d["lessons_completed"]]
+    df = df[~(df["module"] + "/" + df["lesson"].astype(str)).isin(known)]
+    return df[["module", "lesson", "xp_earned"]].to_dict("records")
+
+
+def history_event(progress: Dict[str, Any], sessions: Table = None, exercises: Table = None,
+                  lessons: Table = None, first_session_id: int = 1) -> Tuple[Dict[str, Any], List[Dict]]:
+    """
+    Aggregate historical tables into a 'history_imported' event.
+    
+    Sessions are grouped per day and module, study days are merged with
+    the days already in ``progress`` to recompute streaks, and exercises and
+    lessons are deduplicated against the import itself and ``progress`` -
+    all as column operations, so thousands of rows cost a few pandas calls.
+    
+    Args:
+        progress: Current progress of the learner
+        sessions: Rows with 'module', 'start_time' and 'end_time' or
+            'duration_minutes'; optional 'lesson', 'notes', 'completed'
+        exercises: Rows with 'module', 'exercise_id', 'completed_at'; optional
+            'score' (0.0 to 1.0, default 1.0) and 'skill'
+        lessons: Rows with 'module', 'lesson'; optional 'xp_earned', 'completed_at'
+        first_session_id: Number of the first imported session's id
+        
+    Returns:
+        (event, session log records)
+    """
+    session_rows, session_log = _sessions(sessions, first_session_id)
+    daily_activity = _daily_activity(session_rows)
+    
+    module_minutes = {}
+    if not session_rows.empty:
+        module_minutes = session_rows.groupby("module")["duration_minutes"].sum().astype(float).to_dict()
+    
+    days = np.union1d(np.array(list(progress["daily_activity"]), dtype="datetime64[D]"),
+                      np.array(list(daily_activity), dtype="datetime64[D]"))
+    
+    event = {
+        "type": "history_imported",
+        "daily_activity": daily_activity,
+        "module_minutes": module_minutes,
+        "exercises": _exercises(exercises, progress),
+        "lessons": _lessons(lessons, progress),
+        "streak": _streak(days) if daily_activity else None,
+    }
+    return event, session_log
@@ -0,0 +1,128 @@
+"""
+Serializers for tracker files
+Pretty JSON (default), compact JSON, gzip-compressed JSON or msgpack
+"""
+
+import gzip
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional, only needed for the binary format
+    msgpack = None
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class Serializer:
+    """Turn tracker state into bytes and back."""
+    
+    name = "json"
+    
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, indent=2).encode('utf-8')
+    
+    def loads(self, raw: bytes) -> Any:
+        return json.loads(raw)
+
+
+class CompactJsonSerializer(Serializer):
+    """JSON without indentation or spaces (orjson when installed)."""
+    
+    name = "compact"
+    
+    def dumps(self, data: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(data)
+        return json.dumps(data, separators=(",", ":")).encode('utf-8')
+    
+    def loads(self, raw: bytes) -> Any:
+        if orjson is not None:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # json.dumps writes NaN/Infinity, which orjson rejects (e.g. legacy pretty files)
+                pass
+        return json.loads(raw)
+
+
+class GzipJsonSerializer(CompactJsonSerializer):
+    """Compact JSON compressed with gzip."""
+    
+    name = "gzip"
+    
+    def __init__(self, compresslevel: int = 6):
+        self.compresslevel = compresslevel
+    
+    def dumps(self, data: Any) -> bytes:
+        # mtime=0 keeps the output identical for identical state
+        return gzip.compress(super().dumps(data), compresslevel=self.compresslevel, mtime=0)
+    
+    def loads(self, raw: bytes) -> Any:
+        return super().loads(gzip.decompress(raw))
+
+
+class MsgpackSerializer(Serializer):
+    """Binary msgpack encoding (requires the msgpack package)."""
+    
+    name = "msgpack"
+    
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("The msgpack serializer requires msgpack: pip install msgpack")
+    
+    def dumps(self, data: Any) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+    
+    def loads(self, raw: bytes) -> Any:
+        return msgpack.unpackb(raw, raw=False)
+
+
+SERIALIZERS = {
+    "json": Serializer,
+    "compact": CompactJsonSerializer,
+    "gzip": GzipJsonSerializer,
+    "msgpack": MsgpackSerializer,
+}
+
+
+def get_serializer(serializer: Union[str, Serializer, None] = "json") -> Serializer:
+    """
+    Resolve a serializer argument to an instance.
+    
+    Args:
+        serializer: Name ('json', 'compact', 'gzip', 'msgpack'), instance, or None for 'json'
+        
+    Returns:
+        Serializer instance
+    """
+    if isinstance(serializer, Serializer):
+        return serializer
+    serializer = serializer or "json"
+    if serializer not in SERIALIZERS:
+        raise ValueError(f"Unknown serializer: {serializer}")
+    return SERIALIZERS[serializer]()
+
+
+def loads_any(raw: bytes) -> Any:
+    """
+    Decode bytes written by any serializer, detected from the first bytes.
+    
+    Files written before the serializer option existed are pretty JSON and
+    keep loading unchanged.
+    """
+    if raw.startswith(GZIP_MAGIC):
+        return GzipJsonSerializer().loads(raw)
+    
+    stripped = raw.lstrip()
+    if stripped[:1] in (b"{", b"[") or stripped[:1].isdigit() or stripped[:4] in (b"null", b"true"):
+        return CompactJsonSerializer().loads(raw)
+    
+    return MsgpackSerializer().loads(raw)
@@ -0,0 +1,1004 @@
+"""
+Storage backends for the progress tracker
+JSON files (default) or a SQLite database with indexed tables
+"""
+
+import collections
+import gzip
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterator, Iterable, Tuple, Union
+
+from .progress_serializers import Serializer, get_serializer, loads_any
+
+try:
+    import fcntl
+except ImportError:  # advisory locks are POSIX-only; elsewhere only threads are serialized
+    fcntl = None
+
+
+class FileLock:
+    """
+    Reentrant exclusive lock shared by threads and processes.
+    
+    Uses an advisory ``flock`` on ``path``, so every process (Jupyter kernels,
+    grading workers) that opens the same logs directory waits for the others.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+    
+    def __enter__(self):
+        self._thread_lock.acquire()
+        try:
+            if self._depth == 0:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX)
+                    except OSError:
+                        os.close(fd)
+                        raise
+                self._fd = fd
+            self._depth += 1
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+
+class ProgressStorage:
+    """
+    Interface between ProgressTracker and where its state lives.
+    
+    Progress saves receive optional change hints, tuples such as
+    ``("exercise", module, exercise_id)`` or ``("daily_activity", date)``,
+    naming the parts of the progress dict that changed. Backends that can
+    update records individually use them; ``None`` means "save everything".
+    
+    Several processes may share one backend. Writers hold ``lock()`` while
+    they reload, merge and save; readers never lock, so backends must make
+    every save visible atomically. ``version()`` lets a writer skip the
+    reload when nobody else saved since its last load.
+    
+    Event-sourced backends (``event_sourced = True``) receive the tracker's
+    events through ``append_events`` instead of aggregate saves, and full
+    state through ``save_snapshot`` whenever ``snapshot_due()``.
+    
+    Backends that write files through a Serializer set ``uses_serializer``
+    and accept a ``serializer`` option. Backends whose ``iter_sessions``
+    range query uses an index on start_time and yields sessions in start
+    order set ``indexed_sessions``; the tracker queries them directly
+    instead of keeping its own in-memory index.
+    """
+    
+    event_sourced = False
+    uses_serializer = False
+    indexed_sessions = False
+    
+    def load_progress(self) -> Optional[Dict[str, Any]]:
+        """Return saved progress, or None if nothing was saved yet."""
+        raise NotImplementedError
+    
+    def save_progress(self, progress: Dict[str, Any], changes: Optional[Iterable[Tuple]] = None):
+        """Persist progress (only the hinted parts if ``changes`` is given)."""
+        raise NotImplementedError
+    
+    def load_achievements(self) -> Optional[Dict[str, Any]]:
+        """Return saved achievements, or None if nothing was saved yet."""
+        raise NotImplementedError
+    
+    def save_achievements(self, achievements: Dict[str, Any], changes: Optional[Iterable[str]] = None):
+        """Persist achievements (only the named ones if ``changes`` is given)."""
+        raise NotImplementedError
+    
+    def append_session(self, session: Dict[str, Any]):
+        """
+        Durably add one finished session to the log.
+        
+        The session's 'id' is (re)assigned here, see _number_sessions.
+        """
+        raise NotImplementedError
+    
+    def append_sessions(self, sessions: Iterable[Dict[str, Any]]):
+        """Add many sessions; backends override this to write them in one go."""
+        for session in sessions:
+            self.append_session(session)
+    
+    def _number_sessions(self, sessions: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Give sessions the next sequential ids ('session_0001', ...).
+        
+        Called with lock() held while appending, so processes appending at
+        the same time never hand out the same id. The dicts are updated in
+        place, which also fixes up the tracker's copy of the session.
+        """
+        sessions = list(sessions)
+        for number, session in enumerate(sessions, self.count_sessions() + 1):
+            session["id"] = f"session_{number:04d}"
+        return sessions
+    
+    def iter_sessions(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Stream logged sessions in order.
+        
+        Args:
+            start: Only sessions with start_time >= this ISO date/time
+            end: Only sessions with start_time < this ISO date/time
+        """
+        raise NotImplementedError
+    
+    def count_sessions(self) -> int:
+        """Number of logged sessions; backends override this to avoid a full read."""
+        return sum(1 for _ in self.iter_sessions())
+    
+    def recent_sessions(self, n: int) -> List[Dict]:
+        """The last ``n`` logged sessions, oldest first."""
+        return list(collections.deque(self.iter_sessions(), maxlen=n))
+    
+    def compact_sessions(self, before: str) -> List[Dict[str, Any]]:
+        """
+        Archive sessions that started before ``before`` (ISO date/time).
+        
+        Returns:
+            Summaries of the archive segments written; backends whose session
+            storage does not grow a hot file (SQLite) have nothing to compact
+        """
+        return []
+    
+    def archived_until(self) -> Optional[str]:
+        """Sessions starting before this ISO date/time may be in the archive (None = no archive)."""
+        return None
+    
+    def session_summaries(self) -> List[Dict[str, Any]]:
+        """Per-segment summaries of archived sessions (count, total_minutes, modules, ...)."""
+        return []
+    
+    @contextmanager
+    def transaction(self):
+        """Group several saves so they are applied together where supported."""
+        yield
+    
+    def append_events(self, events: Iterable[Dict[str, Any]]):
+        """Durably log tracker events (event-sourced backends only)."""
+        raise NotImplementedError
+    
+    def snapshot_due(self) -> bool:
+        """Whether enough events were logged since the last snapshot."""
+        return False
+    
+    def save_snapshot(self, progress: Dict[str, Any], achievements: Dict[str, Any]):
+        """Record the full state covering every logged event."""
+        raise NotImplementedError
+    
+    def lock(self):
+        """Exclusive writer lock held across a reload-merge-save cycle."""
+        return nullcontext()
+    
+    def version(self) -> Optional[Any]:
+        """
+        Token that changes whenever another writer saves progress or achievements.
+        
+        Returns:
+            Comparable token, or None if the backend cannot tell (always reload)
+        """
+        return None
+    
+    def close(self):
+        """Release open handles."""
+        pass
+
+
+def _atomic_write(path: Path, raw: bytes):
+    """Write bytes to a temporary file and rename it over ``path``."""
+    tmp_file = path.with_name(path.name + ".tmp")
+    with open(tmp_file, 'wb') as f:
+        f.write(raw)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+def _atomic_write_json(path: Path, data: Any, indent: Optional[int] = 2):
+    """Write JSON to a temporary file and rename it over ``path``."""
+    _atomic_write(path, json.dumps(data, indent=indent).encode('utf-8'))
+
+
+def _file_version(path: Path) -> Optional[Tuple[int, int, int]]:
+    # os.replace gives every save a new inode, so this changes on each write
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _complete_size(f, end: int) -> int:
+    """Byte position just after the last newline of an open binary file of size ``end``."""
+    pos = end
+    while pos > 0:
+        step = min(pos, 1 << 16)
+        pos -= step
+        f.seek(pos)
+        newline = f.read(step).rfind(b"\n")
+        if newline >= 0:
+            return pos + newline + 1
+    return 0
+
+
+def _append_lines(path: Path, data: bytes):
+    """
+    Durably append newline-terminated records to a log file.
+    
+    A crash mid-append can leave a partial last line; it is cut off first,
+    so the new records never get joined onto it. Callers hold the file lock.
+    """
+    with open(path, 'ab') as f:
+        end = f.tell()
+    with open(path, 'r+b') as f:
+        if end:
+            f.seek(end - 1)
+            if f.read(1) != b"\n":
+                end = _complete_size(f, end)
+                f.truncate(end)
+        f.seek(end)
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _parse_session_lines(lines: Iterable[str]) -> Iterator[Dict]:
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            # A crash mid-append can leave a partial last line
+            continue
+
+
+def _in_range(start_time: str, start: Optional[str], end: Optional[str]) -> bool:
+    # ISO 8601 strings of the same format sort chronologically
+    return (start is None or start_time >= start) and (end is None or start_time < end)
+
+
+class JsonStorage(ProgressStorage):
+    """
+    Original file layout: two JSON documents and a JSON-lines session log.
+    
+    The progress and achievements files keep their names whatever the
+    serializer; the format is detected from the file content when loading,
+    so switching serializers never breaks existing files.
+    """
+    
+    uses_serializer = True
+    
+    def __init__(self, progress_dir: Path, serializer: Union[str, Serializer, None] = "json"):
+        self.progress_dir = Path(progress_dir)
+        self.serializer = get_serializer(serializer)
+        self.progress_file = self.progress_dir / "learning_progress.json"
+        self.session_log_file = self.progress_dir / "session_logs.jsonl"
+        self.legacy_session_log_file = self.progress_dir / "session_logs.json"
+        self.achievements_file = self.progress_dir / "achievements.json"
+        self.archive_dir = self.progress_dir / "archive"
+        self.archive_index_file = self.archive_dir / "index.json"
+        self._file_lock = FileLock(self.progress_dir / ".lock")
+        
+        if self.legacy_session_log_file.exists() and not self.session_log_file.exists():
+            with self._file_lock:
+                # Another process may have migrated while we waited
+                if self.legacy_session_log_file.exists() and not self.session_log_file.exists():
+                    self._migrate_session_log()
+        
+        if self.archive_index_file.exists() and self._load_archive_index().get("pending"):
+            with self._file_lock:
+                # A compaction was interrupted after archiving; finish it
+                index = self._load_archive_index()
+                if index.get("pending"):
+                    self._finish_compaction(index)
+    
+    def _migrate_session_log(self):
+        """One-time conversion of session_logs.json to append-only JSON lines."""
+        with open(self.legacy_session_log_file, 'r') as f:
+            sessions = json.load(f)
+        
+        tmp_file = self.session_log_file.with_suffix(".jsonl.tmp")
+        with open(tmp_file, 'w') as f:
+            for session in sessions:
+                f.write(json.dumps(session) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.session_log_file)
+        
+        # Keep the original file around, but out of the way of future loads
+        self.legacy_session_log_file.rename(
+            self.legacy_session_log_file.with_suffix(".json.migrated")
+        )
+    
+    def _load_json(self, path: Path) -> Optional[Dict[str, Any]]:
+        if path.exists():
+            return loads_any(path.read_bytes())
+        return None
+    
+    def load_progress(self) -> Optional[Dict[str, Any]]:
+        return self._load_json(self.progress_file)
+    
+    def save_progress(self, progress: Dict[str, Any], changes: Optional[Iterable[Tuple]] = None):
+        _atomic_write(self.progress_file, self.serializer.dumps(progress))
+    
+    def load_achievements(self) -> Optional[Dict[str, Any]]:
+        return self._load_json(self.achievements_file)
+    
+    def save_achievements(self, achievements: Dict[str, Any], changes: Optional[Iterable[str]] = None):
+        _atomic_write(self.achievements_file, self.serializer.dumps(achievements))
+    
+    def lock(self) -> FileLock:
+        return self._file_lock
+    
+    def version(self) -> Tuple:
+        return (_file_version(self.progress_file), _file_version(self.achievements_file))
+    
+    def append_session(self, session: Dict[str, Any]):
+        self.append_sessions([session])
+    
+    def append_sessions(self, sessions: Iterable[Dict[str, Any]]):
+        # Under the writer lock so compaction never rewrites the log mid-append
+        with self._file_lock:
+            lines = "".join(json.dumps(session) + "\n" for session in self._number_sessions(sessions))
+            _append_lines(self.session_log_file, lines.encode('utf-8'))
+    
+    def _read_hot_sessions(self) -> Iterator[Dict]:
+        if not self.session_log_file.exists():
+            return
+        with open(self.session_log_file, 'r') as f:
+            yield from _parse_session_lines(f)
+    
+    def _read_segment(self, segment: Dict[str, Any]) -> Iterator[Dict]:
+        with gzip.open(self.archive_dir / segment["file"], 'rt') as f:
+            yield from _parse_session_lines(f)
+    
+    def _load_archive_index(self) -> Dict[str, Any]:
+        index = self._load_json(self.archive_index_file)
+        return index or {"archived_until": None, "pending": None, "segments": []}
+    
+    def iter_sessions(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[Dict]:
+        index = self._load_archive_index()
+        
+        # Only open archive segments whose time span overlaps the query
+        for segment in index["segments"]:
+            if start is not None and segment["last_start"] < start:
+                continue
+            if end is not None and segment["first_start"] >= end:
+                continue
+            for session in self._read_segment(segment):
+                if _in_range(session["start_time"], start, end):
+                    yield session
+        
+        # Mid-compaction, sessions before the pending cutoff are already archived
+        pending = index.get("pending")
+        for session in self._read_hot_sessions():
+            if pending is not None and session["start_time"] < pending:
+                continue
+            if _in_range(session["start_time"], start, end):
+                yield session
+    
+    def count_sessions(self) -> int:
+        count = sum(segment["count"] for segment in self._load_archive_index()["segments"])
+        if not self.session_log_file.exists():
+            return count
+        
+        # Count records without parsing them; a partial last line has no newline yet
+        with open(self.session_log_file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                count += chunk.count(b"\n")
+        return count
+    
+    def recent_sessions(self, n: int) -> List[Dict]:
+        recent = collections.deque(self._read_hot_sessions(), maxlen=n)
+        # Reach into the archive only if the hot log is shorter than n
+        for segment in reversed(self._load_archive_index()["segments"]):
+            if len(recent) >= n:
+                break
+            recent.extendleft(reversed(list(self._read_segment(segment))[-(n - len(recent)):]))
+        return list(recent)
+    
+    def archived_until(self) -> Optional[str]:
+        return self._load_archive_index()["archived_until"]
+    
+    def session_summaries(self) -> List[Dict[str, Any]]:
+        return self._load_archive_index()["segments"]
+    
+    def compact_sessions(self, before: str) -> List[Dict[str, Any]]:
+        """
+        Move sessions that started before ``before`` into monthly archive segments.
+        
+        Each compaction writes new gzip-compressed segments (existing ones are
+        never modified) and records them with their summaries in
+        archive/index.json. The index is written before the hot log is
+        rewritten and marks the cutoff as pending until then, so a crash in
+        between is finished on the next open instead of duplicating sessions.
+        """
+        with self._file_lock:
+            index = self._load_archive_index()
+            archived = [s for s in self._read_hot_sessions() if s["start_time"] < before]
+            if not archived:
+                return []
+            
+            by_month: Dict[str, List[Dict]] = {}
+            for session in sorted(archived, key=lambda s: s["start_time"]):
+                by_month.setdefault(session["start_time"][:7], []).append(session)
+            
+            self.archive_dir.mkdir(exist_ok=True)
+            new_segments = []
+            for month, sessions in sorted(by_month.items()):
+                sequence = sum(1 for segment in index["segments"] if segment["month"] == month)
+                name = f"sessions-{month}-{sequence}.jsonl.gz"
+                tmp_file = self.archive_dir / (name + ".tmp")
+                with open(tmp_file, 'wb') as raw, gzip.open(raw, 'wt') as f:
+                    for session in sessions:
+                        f.write(json.dumps(session) + "\n")
+                    f.flush()
+                    raw.flush()
+                    os.fsync(raw.fileno())
+                os.replace(tmp_file, self.archive_dir / name)
+                
+                modules: Dict[str, int] = {}
+                for session in sessions:
+                    modules[session.get("module")] = modules.get(session.get("module"), 0) + 1
+                new_segments.append({
+                    "file": name,
+                    "month": month,
+                    "count": len(sessions),
+                    "total_minutes": sum(s.get("duration_minutes") or 0 for s in sessions),
+                    "modules": modules,
+                    "first_start": sessions[0]["start_time"],
+                    "last_start": sessions[-1]["start_time"],
+                })
+            
+            # Stable sort: segments of one month stay in compaction order
+            index["segments"] = sorted(index["segments"] + new_segments, key=lambda s: s["month"])
+            index["archived_until"] = max(index["archived_until"] or "", before)
+            index["pending"] = before
+            _atomic_write_json(self.archive_index_file, index)
+            
+            self._finish_compaction(index)
+        
+        return new_segments
+    
+    def _finish_compaction(self, index: Dict[str, Any]):
+        """Drop archived sessions from the hot log and clear the pending mark."""
+        pending = index["pending"]
+        tmp_file = self.session_log_file.with_suffix(".jsonl.tmp")
+        with open(tmp_file, 'w') as f:
+            for session in self._read_hot_sessions():
+                if session["start_time"] >= pending:
+                    f.write(json.dumps(session) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.session_log_file)
+        
+        index["pending"] = None
+        _atomic_write_json(self.archive_index_file, index)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_info (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS modules (
+    module TEXT PRIMARY KEY,
+    completed INTEGER NOT NULL,
+    progress_pct NUMERIC NOT NULL,
+    lessons_completed TEXT NOT NULL,
+    time_spent_minutes NUMERIC NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS exercises (
+    module TEXT NOT NULL,
+    exercise_id TEXT NOT NULL,
+    completed_at TEXT NOT NULL,
+    score NUMERIC,
+    PRIMARY KEY (module, exercise_id)
+);
+CREATE INDEX IF NOT EXISTS idx_exercises_completed_at ON exercises (completed_at);
+CREATE TABLE IF NOT EXISTS capstones (
+    project TEXT PRIMARY KEY,
+    completed INTEGER NOT NULL,
+    grade NUMERIC,
+    time_spent_minutes NUMERIC NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS skills (
+    skill TEXT PRIMARY KEY,
+    level INTEGER NOT NULL,
+    confidence INTEGER NOT NULL,
+    exercises_completed INTEGER NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS daily_activity (
+    date TEXT PRIMARY KEY,
+    total_time_minutes NUMERIC NOT NULL,
+    sessions INTEGER NOT NULL,
+    modules_visited TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    start_time TEXT NOT NULL,
+    end_time TEXT,
+    module TEXT,
+    lesson TEXT,
+    notes TEXT,
+    duration_minutes NUMERIC,
+    completed INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_start_time ON sessions (start_time);
+CREATE TABLE IF NOT EXISTS achievements (
+    name TEXT PRIMARY KEY,
+    unlocked INTEGER NOT NULL,
+    date TEXT,
+    description TEXT,
+    position INTEGER NOT NULL
+);
+"""
+
+SESSION_COLUMNS = ("id", "start_time", "end_time", "module", "lesson",
+                   "notes", "duration_minutes", "completed")
+
+
+class SqliteStorage(ProgressStorage):
+    """
+    SQLite database with one indexed table per kind of record.
+    
+    Saves with change hints touch only the affected rows inside a single
+    transaction; session period queries are range scans on start_time.
+    """
+    
+    indexed_sessions = True
+    
+    def __init__(self, progress_dir: Path, filename: str = "progress.db"):
+        self.db_file = Path(progress_dir) / filename
+        self._lock = threading.RLock()
+        self._in_transaction = False
+        self._file_lock = FileLock(self.db_file.parent / ".lock")
+        self.conn = sqlite3.connect(str(self.db_file), check_same_thread=False, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        
+        # Partial saves need a complete baseline to update
+        self._has_progress = self.conn.execute("SELECT 1 FROM user_info LIMIT 1").fetchone() is not None
+        self._has_achievements = self.conn.execute("SELECT 1 FROM achievements LIMIT 1").fetchone() is not None
+    
+    @contextmanager
+    def transaction(self):
+        """Commit every save made inside the block together."""
+        with self._lock:
+            if self._in_transaction:
+                yield
+                return
+            self._in_transaction = True
+            try:
+                with self.conn:
+                    yield
+            finally:
+                self._in_transaction = False
+    
+    def lock(self) -> FileLock:
+        return self._file_lock
+    
+    def version(self) -> int:
+        # Changes when another connection commits, not for our own commits
+        with self._lock:
+            return self.conn.execute("PRAGMA data_version").fetchone()[0]
+    
+    # Loading
+    
+    def load_progress(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            user_info = {row["key"]: json.loads(row["value"])
+                         for row in self.conn.execute("SELECT key, value FROM user_info")}
+            if not user_info:
+                return None
+            
+            progress = {"user_info": user_info, "modules": {}, "capstones": {},
+                        "skills": {}, "daily_activity": {}}
+            
+            for row in self.conn.execute("SELECT * FROM modules ORDER BY position"):
+                progress["modules"][row["module"]] = {
+                    "completed": bool(row["completed"]),
+                    "progress_pct": row["progress_pct"],
+                    "lessons_completed": json.loads(row["lessons_completed"]),
+                    "exercises_completed": [],
+                    "time_spent_minutes": row["time_spent_minutes"],
+                }
+            
+            for row in self.conn.execute("SELECT * FROM exercises ORDER BY rowid"):
+                module = progress["modules"].get(row["module"])
+                if module is not None:
+                    module["exercises_completed"].append({
+                        "id": row["exercise_id"],
+                        "completed_at": row["completed_at"],
+                        "score": row["score"],
+                        "module": row["module"],
+                    })
+            
+            for row in self.conn.execute("SELECT * FROM capstones ORDER BY position"):
+                progress["capstones"][row["project"]] = {
+                    "completed": bool(row["completed"]),
+                    "grade": row["grade"],
+                    "time_spent_minutes": row["time_spent_minutes"],
+                }
+            
+            for row in self.conn.execute("SELECT * FROM skills ORDER BY position"):
+                progress["skills"][row["skill"]] = {
+                    "level": row["level"],
+                    "confidence": row["confidence"],
+                    "exercises_completed": row["exercises_completed"],
+                }
+            
+            for row in self.conn.execute("SELECT * FROM daily_activity ORDER BY date"):
+                progress["daily_activity"][row["date"]] = {
+                    "total_time_minutes": row["total_time_minutes"],
+                    "sessions": row["sessions"],
+                    "modules_visited": json.loads(row["modules_visited"]),
+                }
+            
+            return progress
+    
+    def load_achievements(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            rows = self.conn.execute("SELECT * FROM achievements ORDER BY position").fetchall()
+        if not rows:
+            return None
+        return {
+            row["name"]: {"unlocked": bool(row["unlocked"]), "date": row["date"],
+                          "description": row["description"]}
+            for row in rows
+        }
+    
+    def iter_sessions(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[Dict]:
+        query = f"SELECT {', '.join(SESSION_COLUMNS)} FROM sessions"
+        conditions, params = [], []
+        if start is not None:
+            conditions.append("start_time >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("start_time < ?")
+            params.append(end)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY start_time, rowid"
+        
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        for row in rows:
+            yield self._row_to_session(row)
+    
+    @staticmethod
+    def _row_to_session(row) -> Dict[str, Any]:
+        session = dict(row)
+        if session["completed"] is not None:
+            session["completed"] = bool(session["completed"])
+        return session
+    
+    def count_sessions(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+    
+    def recent_sessions(self, n: int) -> List[Dict]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM sessions ORDER BY start_time DESC, rowid DESC LIMIT ?", (n,)
+            ).fetchall()
+        return [self._row_to_session(row) for row in reversed(rows)]
+    
+    # Saving
+    
+    def _write_user_info(self, progress):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO user_info (key, value) VALUES (?, ?)",
+            [(k, json.dumps(v)) for k, v in progress["user_info"].items()]
+        )
+    
+    def _write_module(self, progress, module, position=None):
+        data = progress["modules"][module]
+        if position is None:
+            position = list(progress["modules"]).index(module)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO modules VALUES (?, ?, ?, ?, ?, ?)",
+            (module, int(data["completed"]), data["progress_pct"],
+             json.dumps(data["lessons_completed"]), data["time_spent_minutes"], position)
+        )
+    
+    def _write_exercise(self, progress, module, exercise_id):
+        for exercise in progress["modules"][module]["exercises_completed"]:
+            if exercise["id"] == exercise_id:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO exercises VALUES (?, ?, ?, ?)",
+                    (module, exercise_id, exercise["completed_at"], exercise["score"])
+                )
+                return
+    
+    def _write_capstone(self, progress, project, position=None):
+        data = progress["capstones"][project]
+        if position is None:
+            position = list(progress["capstones"]).index(project)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO capstones VALUES (?, ?, ?, ?, ?)",
+            (project, int(data["completed"]), data["grade"], data["time_spent_minutes"], position)
+        )
+    
+    def _write_skill(self, progress, skill, position=None):
+        data = progress["skills"][skill]
+        if position is None:
+            position = list(progress["skills"]).index(skill)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO skills VALUES (?, ?, ?, ?, ?)",
+            (skill, data["level"], data["confidence"], data["exercises_completed"], position)
+        )
+    
+    def _write_day(self, progress, date):
+        data = progress["daily_activity"][date]
+        self.conn.execute(
+            "INSERT OR REPLACE INTO daily_activity VALUES (?, ?, ?, ?)",
+            (date, data["total_time_minutes"], data["sessions"], json.dumps(data["modules_visited"]))
+        )
+    
+    def _write_all(self, progress):
+        self._write_user_info(progress)
+        for table in ("modules", "exercises", "capstones", "skills", "daily_activity"):
+            self.conn.execute(f"DELETE FROM {table}")
+        for position, module in enumerate(progress["modules"]):
+            self._write_module(progress, module, position)
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO exercises VALUES (?, ?, ?, ?)",
+                [(module, e["id"], e["completed_at"], e["score"])
+                 for e in progress["modules"][module]["exercises_completed"]]
+            )
+        for position, project in enumerate(progress["capstones"]):
+            self._write_capstone(progress, project, position)
+        for position, skill in enumerate(progress["skills"]):
+            self._write_skill(progress, skill, position)
+        for date in progress["daily_activity"]:
+            self._write_day(progress, date)
+    
+    def save_progress(self, progress: Dict[str, Any], changes: Optional[Iterable[Tuple]] = None):
+        writers = {
+            "user_info": self._write_user_info,
+            "module": self._write_module,
+            "exercise": self._write_exercise,
+            "capstone": self._write_capstone,
+            "skill": self._write_skill,
+            "daily_activity": self._write_day,
+        }
+        with self.transaction():
+            if changes is None or not self._has_progress:
+                self._write_all(progress)
+                self._has_progress = True
+                return
+            for change in set(changes):
+                writers[change[0]](progress, *change[1:])
+    
+    def save_achievements(self, achievements: Dict[str, Any], changes: Optional[Iterable[str]] = None):
+        names = list(achievements) if changes is None or not self._has_achievements else list(changes)
+        positions = {name: i for i, name in enumerate(achievements)}
+        with self.transaction():
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO achievements VALUES (?, ?, ?, ?, ?)",
+                [(name, int(achievements[name]["unlocked"]), achievements[name]["date"],
+                  achievements[name]["description"], positions[name]) for name in names]
+            )
+            self._has_achievements = True
+    
+    def append_session(self, session: Dict[str, Any]):
+        self.append_sessions([session])
+    
+    def append_sessions(self, sessions: Iterable[Dict[str, Any]]):
+        # The file lock keeps other processes from numbering sessions between our count and insert
+        with self._file_lock, self.transaction():
+            rows = []
+            for session in self._number_sessions(sessions):
+                values = [session.get(column) for column in SESSION_COLUMNS]
+                if values[-1] is not None:
+                    values[-1] = int(values[-1])
+                rows.append(values)
+            # Plain INSERT: a duplicate id must fail, never replace a logged session
+            self.conn.executemany(
+                f"INSERT INTO sessions VALUES ({', '.join('?' * len(SESSION_COLUMNS))})",
+                rows
+            )
+    
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+class EventStorage(JsonStorage):
+    """
+    Event log as the source of truth, with periodic snapshots.
+    
+    Every tracker mutation is appended to ``events.jsonl`` as one small
+    line instead of rewriting the progress file. Every ``snapshot_interval``
+    events the full state is written to ``snapshots/``; loading reads the
+    newest snapshot and replays only the events logged after it, and the
+    state at any past date is rebuilt from the snapshot before that date.
+    Sessions are logged exactly like JsonStorage does.
+    """
+    
+    event_sourced = True
+    
+    def __init__(self, progress_dir: Path, snapshot_interval: int = 100,
+                 serializer: Union[str, Serializer, None] = "compact"):
+        super().__init__(progress_dir, serializer)
+        self.events_file = self.progress_dir / "events.jsonl"
+        self.snapshot_dir = self.progress_dir / "snapshots"
+        self.snapshot_interval = snapshot_interval
+    
+    def version(self) -> Optional[Tuple[int, int, int]]:
+        # The event log only grows, so its size changes with every write
+        return _file_version(self.events_file)
+    
+    def _snapshot_files(self) -> List[Path]:
+        if not self.snapshot_dir.exists():
+            return []
+        # Names carry the zero-padded log offset, so they sort chronologically
+        return sorted(self.snapshot_dir.glob("snapshot-*.json"))
+    
+    def load_snapshot(self, before: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Newest snapshot, or the newest one taken before an ISO date/time.
+        
+        Returns:
+            Dict with 'progress' and 'achievements' (None if there is no
+            earlier state), 'offset' (byte position in the event log where
+            replay continues) and 'at' (time of the last event included)
+        """
+        for path in reversed(self._snapshot_files()):
+            snapshot = self._load_json(path)
+            if before is None or snapshot["at"] < before:
+                return snapshot
+        
+        # No snapshot yet: start from files written by JsonStorage, if any
+        return {"progress": super().load_progress(), "achievements": super().load_achievements(),
+                "offset": 0, "events": 0, "at": None}
+    
+    def load_progress(self) -> Optional[Dict[str, Any]]:
+        """Progress as of the newest snapshot (events after it are not applied)."""
+        return self.load_snapshot()["progress"]
+    
+    def load_achievements(self) -> Optional[Dict[str, Any]]:
+        """Achievements as of the newest snapshot (events after it are not applied)."""
+        return self.load_snapshot()["achievements"]
+    
+    def save_progress(self, progress: Dict[str, Any], changes: Optional[Iterable[Tuple]] = None):
+        # State is derived from events; it is only written as snapshots
+        pass
+    
+    def save_achievements(self, achievements: Dict[str, Any], changes: Optional[Iterable[str]] = None):
+        pass
+    
+    def append_events(self, events: Iterable[Dict[str, Any]]):
+        lines = "".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events)
+        with self._file_lock:
+            _append_lines(self.events_file, lines.encode('utf-8'))
+    
+    def iter_events(self, offset: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Stream logged events in order.
+        
+        Args:
+            offset: Byte position to start at (a snapshot's 'offset')
+        """
+        if not self.events_file.exists():
+            return
+        with open(self.events_file, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A crash mid-append can leave a partial last line
+                    break
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # Damaged line (e.g. from an older version joining a partial line)
+                    continue
+                yield event
+    
+    def snapshot_due(self) -> bool:
+        if not self.events_file.exists():
+            return False
+        snapshots = self._snapshot_files()
+        offset = int(snapshots[-1].stem.split("-")[1]) if snapshots else 0
+        with open(self.events_file, 'rb') as f:
+            f.seek(offset)
+            pending = sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b""))
+        return pending >= self.snapshot_interval
+    
+    def save_snapshot(self, progress: Dict[str, Any], achievements: Dict[str, Any]):
+        # Callers hold lock(), so the state covers every event in the log
+        with self._file_lock:
+            previous = self.load_snapshot()
+            offset = 0
+            if self.events_file.exists():
+                # End of the last complete event: a partial line is cut off by the next append
+                with open(self.events_file, 'rb') as f:
+                    offset = _complete_size(f, f.seek(0, os.SEEK_END))
+            new_events = list(self.iter_events(previous["offset"]))
+            snapshot = {
+                "at": new_events[-1]["at"] if new_events else previous["at"],
+                "offset": offset,
+                "events": previous.get("events", 0) + len(new_events),
+                "progress": progress,
+                "achievements": achievements,
+            }
+            self.snapshot_dir.mkdir(exist_ok=True)
+            _atomic_write(self.snapshot_dir / f"snapshot-{offset:012d}.json", self.serializer.dumps(snapshot))
+
+
+STORAGE_BACKENDS = {
+    "json": JsonStorage,
+    "sqlite": SqliteStorage,
+    "events": EventStorage,
+}
+
+
+def create_storage(storage, progress_dir: Path, **options) -> ProgressStorage:
+    """
+    Resolve a storage argument to a backend instance.
+    
+    Args:
+        storage: Backend name ('json', 'sqlite' or 'events') or a ProgressStorage instance
+        progress_dir: Directory the backend keeps its files in
+        **options: Backend options, e.g. serializer='gzip' for 'json' and 'events'
+        
+    Returns:
+        ProgressStorage instance
+    """
+    if isinstance(storage, ProgressStorage):
+        return storage
+    if storage not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {storage}")
+    backend = STORAGE_BACKENDS[storage]
+    if options.get("serializer") is not None and not backend.uses_serializer:
+        raise ValueError(f"The '{storage}' storage backend does not support serializers "
+                         f"(only {', '.join(n for n, b in STORAGE_BACKENDS.items() if b.uses_serializer)} do)")
+    return backend(progress_dir, **options)
+
+
+def copy_storage(source: ProgressStorage, target: ProgressStorage):
+    """
+    Copy all tracker state from one backend to another (e.g. JSON to SQLite).
+    
+    Args:
+        source: Backend to read from
+        target: Backend to write to (should be empty)
+    """
+    progress = source.load_progress()
+    if progress is not None:
+        target.save_progress(progress)
+    
+    achievements = source.load_achievements()
+    if achievements is not None:
+        target.save_achievements(achievements)
+    
+    # Sessions are numbered again in log order by the target
+    target.append_sessions(source.iter_sessions())
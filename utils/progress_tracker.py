@@ -3,13 +3,35 @@ Progress Tracking System for ML Learning Platform
 Tracks study sessions, exercise completion, and skill development.
 """
 
-import json
+import atexit
+import bisect
+import copy
+import functools
+import itertools
 import os
-from datetime import datetime, timedelta
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Union
 import time
 
+from .achievement_rules import AchievementEngine, AchievementRule
+from .progress_storage import ProgressStorage, create_storage
+
+
+# Length in days of the named report periods
+REPORT_PERIODS = {"daily": 1, "weekly": 7, "monthly": 30, "yearly": 365}
+
+
+def _synchronized(method):
+    """Run a tracker method while holding the tracker lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class ProgressTracker:
     """
@@ -22,34 +44,154 @@ class ProgressTracker:
     - Learning velocity and consistency
     """
     
-    def __init__(self, base_path: str = "."):
+    def __init__(self, base_path: str = ".", storage: Union[str, ProgressStorage] = "json",
+                 autosave_delay: Optional[float] = None,
+                 logs_dir: Optional[str] = None,
+                 background: bool = False,
+                 max_pending: int = 10000,
+                 serializer: Optional[str] = None,
+                 achievement_rules: Optional[List[AchievementRule]] = None):
         """
         Initialize progress tracker.
         
         Args:
             base_path: Base directory path for the learning platform
+            storage: Storage backend, 'json' (default), 'sqlite', 'events' (event log
+                with snapshots) or a ProgressStorage instance
+            autosave_delay: If set, coalesce saves and write them once no mutation
+                happened for this many seconds (and at interpreter exit)
+            logs_dir: Directory holding this learner's state (default: base_path/logs)
+            background: Save on a background writer thread so tracker calls
+                return without waiting for the disk; see flush()
+            max_pending: In background mode, block new updates while this
+                many are still waiting to be written
+            serializer: File format for the 'json' and 'events' backends: 'json'
+                (pretty, default), 'compact', 'gzip' or 'msgpack'. The 'sqlite'
+                backend has no serializer; passing one raises ValueError.
+                Ignored when storage is a ProgressStorage instance
+            achievement_rules: Rules that unlock achievements (default: the
+                rules of utils.achievement_rules.default_rules)
         """
         self.base_path = Path(base_path)
-        self.progress_dir = self.base_path / "logs"
-        self.progress_dir.mkdir(exist_ok=True)
+        self.progress_dir = Path(logs_dir) if logs_dir is not None else self.base_path / "logs"
+        self.progress_dir.mkdir(parents=True, exist_ok=True)
         
-        self.progress_file = self.progress_dir / "learning_progress.json"
-        self.session_log_file = self.progress_dir / "session_logs.json"
-        self.achievements_file = self.progress_dir / "achievements.json"
+        self.serializer = serializer
+        options = {"serializer": serializer} if serializer is not None else {}
+        self.storage = create_storage(storage, self.progress_dir, **options)
         
-        self.progress = self._load_progress()
-        self.session_log = self._load_session_log()
-        self.achievements = self._load_achievements()
+        # State is loaded on first access (see the properties below). The
+        # version is taken before any load, so a save racing a load forces a
+        # reload before our next write.
+        self._lock = threading.RLock()
+        self._rules = AchievementEngine(achievement_rules)
+        self._storage_version = self.storage.version()
+        self._progress = None
+        self._session_log = None
+        self._achievements = None
+        self._rollups = None
+        self._sessions_by_start = None
         
         self.current_session = None
         self.session_start_time = None
         
-    def _load_progress(self) -> Dict[str, Any]:
-        """Load progress from JSON file or create new."""
-        if self.progress_file.exists():
-            with open(self.progress_file, 'r') as f:
-                return json.load(f)
+        # Unsaved events (see _apply) and deferred saves for batch()/autosave
+        self._pending_events: List[Dict[str, Any]] = []
+        self._pending_changes = set()
+        self._replaying = False
+        self._batch_depth = 0
+        self._autosave_timer = None
+        self.autosave_delay = autosave_delay
+        if autosave_delay is not None:
+            atexit.register(self.flush)
+        
+        # Background writer: mutations only queue work and wake the thread
+        self._wake = threading.Condition(self._lock)
+        self._pending_sessions: List[Dict] = []
+        self._writing = False
+        self._writer_error = None
+        self._stopping = False
+        self.max_pending = max_pending
+        self._writer = None
+        if background:
+            self._writer = threading.Thread(target=self._writer_loop, name="ProgressWriter", daemon=True)
+            self._writer.start()
+            atexit.register(self.flush)
         
+    @property
+    def progress(self) -> Dict[str, Any]:
+        """Progress dict, loaded from storage on first access."""
+        if self._progress is None:
+            with self._lock:
+                if self._progress is None:
+                    self._load_state()
+        return self._progress
+    
+    @progress.setter
+    def progress(self, progress: Dict[str, Any]):
+        self._progress = progress
+        self._build_indexes()
+    
+    @property
+    def session_log(self) -> List[Dict]:
+        """All logged sessions, loaded on first access (prefer iter_sessions for ranges)."""
+        if self._session_log is None:
+            with self._lock:
+                if self._session_log is None:
+                    self._session_log = self._load_session_log()
+        return self._session_log
+    
+    @property
+    def achievements(self) -> Dict[str, Any]:
+        """Achievements dict, loaded from storage on first access."""
+        if self._achievements is None:
+            with self._lock:
+                if self._achievements is None:
+                    self._load_state(achievements_only=True)
+        return self._achievements
+    
+    @achievements.setter
+    def achievements(self, achievements: Dict[str, Any]):
+        self._achievements = achievements
+    
+    def _load_state(self, achievements_only: bool = False):
+        """
+        Load state from storage.
+        
+        Event-sourced storage always loads progress and achievements together:
+        the newest snapshot, with the events logged after it replayed on top.
+        """
+        if self.storage.event_sourced:
+            snapshot = self.storage.load_snapshot()
+            self.progress = snapshot["progress"] or self._new_progress()
+            self._achievements = snapshot["achievements"] or self._new_achievements()
+            self._replay(self.storage.iter_events(snapshot["offset"]))
+        elif achievements_only:
+            self._achievements = self._load_achievements()
+        else:
+            self.progress = self._load_progress()
+    
+    def _replay(self, events: Iterable[Dict[str, Any]]) -> set:
+        """Apply already logged or already recorded events; return their change hints."""
+        changes = set()
+        self._replaying = True
+        try:
+            for event in events:
+                changes.update(self._apply(event))
+        finally:
+            self._replaying = False
+        return changes
+    
+    def _load_progress(self) -> Dict[str, Any]:
+        """Load progress from storage or create new."""
+        progress = self.storage.load_progress()
+        if progress is not None:
+            return progress
+        return self._new_progress()
+    
+    @staticmethod
+    def _new_progress() -> Dict[str, Any]:
+        """Progress of a learner who has not started yet."""
         return {
             "user_info": {
                 "start_date": datetime.now().isoformat(),
@@ -82,19 +224,55 @@ class ProgressTracker:
             "daily_activity": {}
         }
     
+    def _build_indexes(self):
+        """
+        Rebuild lookup sets and running counters from self.progress.
+        
+        Duplicate checks and get_stats use these instead of scanning the
+        completion lists; the _apply_* handlers keep them in sync.
+        """
+        modules = self._progress["modules"]
+        self._lesson_ids = {m: set(d["lessons_completed"]) for m, d in modules.items()}
+        self._exercise_ids = {m: {e["id"] for e in d["exercises_completed"]} for m, d in modules.items()}
+        self._counts = {
+            "modules_completed": sum(1 for d in modules.values() if d["completed"]),
+            "lessons_completed": sum(len(ids) for ids in self._lesson_ids.values()),
+            "exercises_completed": sum(len(ids) for ids in self._exercise_ids.values()),
+            "capstones_completed": sum(1 for c in self._progress["capstones"].values() if c["completed"]),
+        }
+        
+        self._rules.reset(self._progress)
+        
+        # Rollups for reports, built on first use
+        self._rollups = None
+    
     def _load_session_log(self) -> List[Dict]:
-        """Load session logs from JSON file or create new."""
-        if self.session_log_file.exists():
-            with open(self.session_log_file, 'r') as f:
-                return json.load(f)
-        return []
+        """Load session logs from storage."""
+        return list(self.iter_sessions())
     
-    def _load_achievements(self) -> Dict[str, Any]:
-        """Load achievements from JSON file or create new."""
-        if self.achievements_file.exists():
-            with open(self.achievements_file, 'r') as f:
-                return json.load(f)
+    def iter_sessions(self, start: Optional[str] = None, end: Optional[str] = None):
+        """
+        Stream logged sessions without loading the whole log into memory.
         
+        Args:
+            start: Only sessions starting at or after this ISO date/time
+            end: Only sessions starting before this ISO date/time
+            
+        Yields:
+            Session dictionaries in the order they were logged
+        """
+        return self.storage.iter_sessions(start, end)
+    
+    def _load_achievements(self) -> Dict[str, Any]:
+        """Load achievements from storage or create new."""
+        achievements = self.storage.load_achievements()
+        if achievements is not None:
+            return achievements
+        return self._new_achievements()
+    
+    @staticmethod
+    def _new_achievements() -> Dict[str, Any]:
+        """Achievements of a learner who has not started yet."""
         return {
             "scholar": {"unlocked": False, "date": None, "description": "Complete your first module"},
             "mathematician": {"unlocked": False, "date": None, "description": "Complete Module 1 with all exercises correct"},
@@ -107,25 +285,299 @@ class ProgressTracker:
             "perfectionist": {"unlocked": False, "date": None, "description": "Score 100% on all exercises in a module"},
         }
     
-    def _save_progress(self):
-        """Save current progress to JSON file."""
-        with open(self.progress_file, 'w') as f:
-            json.dump(self.progress, f, indent=2)
+    def _append_session(self, session: Dict):
+        """Durably append one session to the session log (or queue it for the writer)."""
+        self._append_sessions([session])
+    
+    def _append_sessions(self, sessions: List[Dict]):
+        if self._writer is not None:
+            self._pending_sessions.extend(sessions)
+            self._wake.notify_all()
+            return
+        self.storage.append_sessions(sessions)
+    
+    # Every mutation is an event: a dict with a 'type' and everything needed
+    # to apply it again (including its timestamp). Events are applied to the
+    # in-memory state right away and kept until they are saved, so that when
+    # another process saved in the meantime they can be replayed on top of
+    # its state instead of overwriting it.
+    
+    def _apply(self, event: Dict[str, Any]) -> List[tuple]:
+        """
+        Apply one event to the in-memory state.
+        
+        Args:
+            event: Event dict, see the _apply_* handlers
+            
+        Returns:
+            Change hints for what was modified; ("achievement", name) marks
+            achievements, everything else is a progress hint
+        """
+        changes = getattr(self, f"_apply_{event['type']}")(event)
+        
+        # Events that changed nothing (e.g. a repeated exercise) cannot unlock anything
+        if changes:
+            for achievement in self._rules.evaluate(event, self.progress):
+                changes += self._unlock(achievement, event["at"])
+        return changes
+    
+    def _record(self, event: Dict[str, Any]):
+        """Apply an event and save it now, or later inside batch()/autosave mode."""
+        changes = self._apply(event)
+        if not changes:
+            return
+        
+        self._pending_events.append(event)
+        self._pending_changes.update(changes)
+        
+        if self._writer is not None:
+            self._wake.notify_all()
+            # Backpressure: let the writer catch up before accepting more
+            while len(self._pending_events) >= self.max_pending and self._writer.is_alive():
+                self._wake.wait()
+        elif self._deferring():
+            self._schedule_autosave()
+        else:
+            self.flush()
+    
+    def _deferring(self) -> bool:
+        return self._batch_depth > 0 or self.autosave_delay is not None
+    
+    def _schedule_autosave(self):
+        """Restart the autosave timer so a burst of mutations is written once."""
+        if self.autosave_delay is None or self._batch_depth > 0:
+            return
+        if self._autosave_timer is not None:
+            self._autosave_timer.cancel()
+        self._autosave_timer = threading.Timer(self.autosave_delay, self.flush)
+        self._autosave_timer.daemon = True
+        self._autosave_timer.start()
     
-    def _save_session_log(self):
-        """Save session logs to JSON file."""
-        with open(self.session_log_file, 'w') as f:
-            json.dump(self.session_log, f, indent=2)
+    def _storage_changed(self) -> bool:
+        """Whether another writer saved since we last loaded or saved."""
+        version = self.storage.version()
+        return version is None or version != self._storage_version
     
-    def _save_achievements(self):
-        """Save achievements to JSON file."""
-        with open(self.achievements_file, 'w') as f:
-            json.dump(self.achievements, f, indent=2)
+    def _reload(self):
+        """Load the latest saved state and replay unsaved events on top of it."""
+        self._storage_version = self.storage.version()
+        self._load_state()
+        if not self.storage.event_sourced:
+            self._load_state(achievements_only=True)
+        self._pending_changes = self._replay(self._pending_events)
+    
+    @_synchronized
+    def refresh(self):
+        """Pick up progress saved by other processes (unsaved changes are kept)."""
+        if not self._storage_changed():
+            return
+        if self._pending_events:
+            self._reload()
+        else:
+            # Nothing to replay: drop cached state and load it again when used
+            self._storage_version = self.storage.version()
+            self._progress = None
+            self._session_log = None
+            self._achievements = None
+            self._sessions_by_start = None
+    
+    @_synchronized
+    def flush(self):
+        """
+        Write all unsaved changes to storage.
+        
+        Holds the storage's writer lock while merging: if another process
+        saved since our last load, its state is reloaded and our unsaved
+        events are replayed on it before writing, so no update is lost.
+        In background mode this waits until the writer thread has written
+        everything recorded so far, and re-raises its last error.
+        """
+        if self._autosave_timer is not None:
+            self._autosave_timer.cancel()
+            self._autosave_timer = None
+        
+        if self._writer is not None:
+            self._wake.notify_all()
+            while (self._pending_events or self._pending_sessions or self._writing) and self._writer.is_alive():
+                if self._writer_error is not None:
+                    break
+                self._wake.wait()
+            error, self._writer_error = self._writer_error, None
+            if error is not None:
+                raise error
+            return
+        
+        if not self._pending_events:
+            return
+        
+        with self.storage.lock():
+            if self._storage_changed():
+                self._reload()
+            self._save(self._pending_events, self._pending_changes, self.progress, self.achievements)
+            self._storage_version = self.storage.version()
+        
+        self._pending_events = []
+        self._pending_changes = set()
+    
+    def _save(self, events: List[Dict[str, Any]], changes: set,
+              progress: Dict[str, Any], achievements: Dict[str, Any]):
+        """Write recorded events (or the state they changed) in one transaction."""
+        progress_changes = [c for c in changes if c[0] != "achievement"]
+        achievement_changes = [c[1] for c in changes if c[0] == "achievement"]
+        
+        with self.storage.transaction():
+            if self.storage.event_sourced:
+                self.storage.append_events(events)
+                if self.storage.snapshot_due():
+                    self.storage.save_snapshot(progress, achievements)
+            else:
+                if progress_changes:
+                    self.storage.save_progress(progress, progress_changes)
+                if achievement_changes:
+                    self.storage.save_achievements(achievements, achievement_changes)
+    
+    def _writer_loop(self):
+        """Background thread: write whatever was recorded since the last write."""
+        while True:
+            with self._lock:
+                # Inside batch() wait for its end, unless backpressure needs a write
+                while not self._stopping and (
+                    not (self._pending_events or self._pending_sessions)
+                    or (self._batch_depth > 0 and len(self._pending_events) < self.max_pending)
+                ):
+                    self._wake.wait()
+                if self._stopping and not (self._pending_events or self._pending_sessions):
+                    return
+            
+            if not self._write_pending():
+                # Storage failed (disk full, network mount gone); retry later
+                time.sleep(1.0)
+    
+    def _write_pending(self) -> bool:
+        """Take everything pending under the lock, then write it outside the lock."""
+        events, changes, sessions = [], set(), []
+        try:
+            with self.storage.lock():
+                with self._lock:
+                    if self._pending_events and self._storage_changed():
+                        self._reload()
+                    events, self._pending_events = self._pending_events, []
+                    changes, self._pending_changes = self._pending_changes, set()
+                    sessions, self._pending_sessions = self._pending_sessions, []
+                    # Copies, so the caller keeps mutating while we write
+                    progress = copy.deepcopy(self._progress) if events else None
+                    achievements = copy.deepcopy(self._achievements) if events else None
+                    self._writing = True
+                    self._wake.notify_all()
+                
+                if sessions:
+                    self.storage.append_sessions(sessions)
+                    sessions = []
+                if events:
+                    self._save(events, changes, progress, achievements)
+                
+                with self._lock:
+                    self._storage_version = self.storage.version()
+            return True
+        except Exception as e:
+            with self._lock:
+                # Put everything back in front of what was recorded meanwhile
+                self._pending_events = events + self._pending_events
+                self._pending_changes |= changes
+                self._pending_sessions = sessions + self._pending_sessions
+                self._writer_error = e
+            print(f"✗ Failed to save progress: {e}")
+            return False
+        finally:
+            with self._lock:
+                self._writing = False
+                self._wake.notify_all()
+    
+    def state_at(self, when: Union[str, date, datetime]) -> Dict[str, Any]:
+        """
+        Rebuild progress and achievements as they were at a past moment.
+        
+        Requires the 'events' storage backend. Starts from the newest
+        snapshot taken before ``when`` and replays logged events up to it.
+        
+        Args:
+            when: Date (state at the end of that day) or ISO date/time
+            
+        Returns:
+            Dict with 'progress' and 'achievements'
+        """
+        if not self.storage.event_sourced:
+            raise ValueError("state_at needs the 'events' storage backend")
+        
+        if isinstance(when, datetime):
+            until = when.isoformat()
+        elif isinstance(when, date):
+            until = (when + timedelta(days=1)).isoformat()
+        elif "T" in when:
+            until = when
+        else:
+            until = (date.fromisoformat(when) + timedelta(days=1)).isoformat()
+        
+        snapshot = self.storage.load_snapshot(before=until)
+        # Copies of the rules: they keep counters, and the live ones must not be reset
+        replica = ProgressTracker(self.base_path, self.storage, logs_dir=self.progress_dir,
+                                  serializer=self.serializer,
+                                  achievement_rules=copy.deepcopy(self._rules.rules))
+        replica.progress = snapshot["progress"] or self._new_progress()
+        replica.achievements = snapshot["achievements"] or self._new_achievements()
+        # Events are replayed in log order, which is the order they were saved
+        replica._replay(itertools.takewhile(lambda e: e["at"] < until,
+                                            self.storage.iter_events(snapshot["offset"])))
+        return {"progress": replica.progress, "achievements": replica.achievements}
+    
+    def close(self):
+        """Save pending changes, stop the writer thread and release the storage backend."""
+        self.flush()
+        writer = self._writer
+        if writer is not None:
+            with self._lock:
+                self._stopping = True
+                self._wake.notify_all()
+            writer.join()
+            self._writer = None
+            atexit.unregister(self.flush)
+        if self.autosave_delay is not None:
+            atexit.unregister(self.flush)
+        self.storage.close()
+    
+    @contextmanager
+    def batch(self):
+        """
+        Group many updates into a single write.
+        
+        Example:
+            with tracker.batch():
+                for exercise_id, score in results:
+                    tracker.mark_exercise_complete("module_1", exercise_id, score)
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    if self._writer is not None:
+                        self._wake.notify_all()
+                    elif self.autosave_delay is None:
+                        self.flush()
+                    else:
+                        self._schedule_autosave()
     
     def start_session(self, module: str, lesson: str, notes: str = "") -> Dict:
         """
         Start a new study session.
         
+        The id given here is provisional: the storage backend assigns the
+        final sequential id when the ended session is saved, under its lock,
+        so learners' kernels running at the same time never share one.
+        
         Args:
             module: Module identifier (e.g., 'module_1')
             lesson: Lesson/project identifier
@@ -135,8 +587,10 @@ class ProgressTracker:
             Session information dictionary
         """
         self.session_start_time = datetime.now()
+        # Counting is much cheaper than loading the log, and sees other processes' sessions
+        session_count = self.storage.count_sessions() + len(self._pending_sessions)
         self.current_session = {
-            "id": f"session_{len(self.session_log) + 1:04d}",
+            "id": f"session_{session_count + 1:04d}",
             "start_time": self.session_start_time.isoformat(),
             "module": module,
             "lesson": lesson,
@@ -147,6 +601,7 @@ class ProgressTracker:
         
         return self.current_session
     
+    @_synchronized
     def end_session(self, completed: bool = False) -> Dict:
         """
         End the current study session.
@@ -167,19 +622,42 @@ class ProgressTracker:
         self.current_session["duration_minutes"] = round(duration, 2)
         self.current_session["completed"] = completed
         
-        # Add to session log
-        self.session_log.append(self.current_session)
-        self._save_session_log()
+        # Add to session log (a log that was never loaded will read it from storage)
+        if self._session_log is not None:
+            self._session_log.append(self.current_session)
+        if self._sessions_by_start is not None:
+            starts, sessions = self._sessions_by_start
+            position = bisect.bisect_right(starts, self.current_session["start_time"])
+            starts.insert(position, self.current_session["start_time"])
+            sessions.insert(position, self.current_session)
+        self._append_session(self.current_session)
+        
+        self._record({
+            "type": "session_ended",
+            "at": end_time.isoformat(),
+            "module": self.current_session["module"],
+            "duration_minutes": duration,
+        })
+        
+        session_info = self.current_session.copy()
+        self.current_session = None
+        self.session_start_time = None
+        
+        return session_info
+    
+    def _apply_session_ended(self, event: Dict[str, Any]) -> List[tuple]:
+        end_date = datetime.fromisoformat(event["at"]).date()
+        duration = event["duration_minutes"]
         
         # Update user stats
         self.progress["user_info"]["total_study_time_minutes"] += duration
-        self.progress["user_info"]["last_study_date"] = end_time.date().isoformat()
         
-        # Update streak
-        self._update_streak(end_time.date())
+        # Update streak (needs the previous study date, so before overwriting it)
+        self._update_streak(end_date)
+        self.progress["user_info"]["last_study_date"] = end_date.isoformat()
         
         # Update daily activity
-        date_str = end_time.date().isoformat()
+        date_str = end_date.isoformat()
         if date_str not in self.progress["daily_activity"]:
             self.progress["daily_activity"][date_str] = {
                 "total_time_minutes": 0,
@@ -189,22 +667,19 @@ class ProgressTracker:
         
         self.progress["daily_activity"][date_str]["total_time_minutes"] += duration
         self.progress["daily_activity"][date_str]["sessions"] += 1
+        self._note_activity(date_str, duration)
         
-        if self.current_session["module"] not in self.progress["daily_activity"][date_str]["modules_visited"]:
-            self.progress["daily_activity"][date_str]["modules_visited"].append(self.current_session["module"])
+        if event["module"] not in self.progress["daily_activity"][date_str]["modules_visited"]:
+            self.progress["daily_activity"][date_str]["modules_visited"].append(event["module"])
         
         # Update module time
-        module = self.current_session["module"]
+        module = event["module"]
+        changes = [("user_info",), ("daily_activity", date_str)]
         if module in self.progress["modules"]:
             self.progress["modules"][module]["time_spent_minutes"] += duration
+            changes.append(("module", module))
         
-        self._save_progress()
-        
-        session_info = self.current_session.copy()
-        self.current_session = None
-        self.session_start_time = None
-        
-        return session_info
+        return changes
     
     def _update_streak(self, study_date):
         """Update study streak based on last study date."""
@@ -232,11 +707,8 @@ class ProgressTracker:
         
         if current_streak > longest_streak:
             self.progress["user_info"]["longest_streak_days"] = current_streak
-        
-        # Check for consistent learner achievement
-        if current_streak >= 30 and not self.achievements["consistent_learner"]["unlocked"]:
-            self.unlock_achievement("consistent_learner")
     
+    @_synchronized
     def mark_lesson_complete(self, module: str, lesson: str, xp_earned: int = 0):
         """
         Mark a lesson or project as completed.
@@ -249,27 +721,47 @@ class ProgressTracker:
         if module not in self.progress["modules"]:
             raise ValueError(f"Unknown module: {module}")
         
+        self._record({
+            "type": "lesson_completed",
+            "at": datetime.now().isoformat(),
+            "module": module,
+            "lesson": lesson,
+            "xp_earned": xp_earned,
+        })
+    
+    def _apply_lesson_completed(self, event: Dict[str, Any]) -> List[tuple]:
+        module, lesson = event["module"], event["lesson"]
         module_data = self.progress["modules"][module]
+        changes = [("module", module), ("user_info",)]
         
-        if lesson not in module_data["lessons_completed"]:
+        if lesson not in self._lesson_ids[module]:
             module_data["lessons_completed"].append(lesson)
+            self._lesson_ids[module].add(lesson)
+            self._counts["lessons_completed"] += 1
             
-            # Calculate progress percentage
-            # This would need module-specific total lesson counts
-            total_lessons = self._get_module_lesson_count(module)
-            if total_lessons > 0:
-                module_data["progress_pct"] = (len(module_data["lessons_completed"]) / total_lessons) * 100
-            
-            # Check if module is complete
-            if module_data["progress_pct"] >= 100:
-                module_data["completed"] = True
-                self.unlock_achievement("scholar")
+            self._update_module_progress(module)
         
         # Add XP
-        self.progress["user_info"]["total_xp"] += xp_earned
+        self.progress["user_info"]["total_xp"] += event["xp_earned"]
         self._update_level()
         
-        self._save_progress()
+        return changes
+    
+    def _update_module_progress(self, module: str):
+        """Recompute a module's progress percentage and completion from its lessons."""
+        module_data = self.progress["modules"][module]
+        
+        # Calculate progress percentage
+        # This would need module-specific total lesson counts
+        total_lessons = self._get_module_lesson_count(module)
+        if total_lessons > 0:
+            module_data["progress_pct"] = (len(module_data["lessons_completed"]) / total_lessons) * 100
+        
+        # Check if module is complete
+        if module_data["progress_pct"] >= 100:
+            if not module_data["completed"]:
+                self._counts["modules_completed"] += 1
+            module_data["completed"] = True
     
     def _get_module_lesson_count(self, module: str) -> int:
         """Get total number of lessons in a module."""
@@ -289,6 +781,7 @@ class ProgressTracker:
         new_level = 1 + xp // 1000
         self.progress["user_info"]["current_level"] = new_level
     
+    @_synchronized
     def mark_exercise_complete(self, module: str, exercise_id: str, score: float = 1.0, skill: Optional[str] = None):
         """
         Mark an exercise as completed.
@@ -302,30 +795,45 @@ class ProgressTracker:
         if module not in self.progress["modules"]:
             raise ValueError(f"Unknown module: {module}")
         
-        exercise_data = {
-            "id": exercise_id,
-            "completed_at": datetime.now().isoformat(),
+        self._record({
+            "type": "exercise_completed",
+            "at": datetime.now().isoformat(),
+            "module": module,
+            "exercise_id": exercise_id,
             "score": score,
-            "module": module
-        }
-        
+            "skill": skill,
+        })
+    
+    def _apply_exercise_completed(self, event: Dict[str, Any]) -> List[tuple]:
+        module, exercise_id, skill = event["module"], event["exercise_id"], event["skill"]
         module_data = self.progress["modules"][module]
         
         # Check if already completed
-        existing = [e for e in module_data["exercises_completed"] if e["id"] == exercise_id]
-        if not existing:
-            module_data["exercises_completed"].append(exercise_data)
+        if exercise_id in self._exercise_ids[module]:
+            return []
+        
+        module_data["exercises_completed"].append({
+            "id": exercise_id,
+            "completed_at": event["at"],
+            "score": event["score"],
+            "module": module
+        })
+        self._exercise_ids[module].add(exercise_id)
+        self._counts["exercises_completed"] += 1
+        changes = [("exercise", module, exercise_id)]
+        
+        # Update skill
+        if skill and skill in self.progress["skills"]:
+            self.progress["skills"][skill]["exercises_completed"] += 1
             
-            # Update skill
-            if skill and skill in self.progress["skills"]:
-                self.progress["skills"][skill]["exercises_completed"] += 1
-                
-                # Update skill level based on exercises
-                exercise_count = self.progress["skills"][skill]["exercises_completed"]
-                self.progress["skills"][skill]["level"] = min(exercise_count // 10, 10)
+            # Update skill level based on exercises
+            exercise_count = self.progress["skills"][skill]["exercises_completed"]
+            self.progress["skills"][skill]["level"] = min(exercise_count // 10, 10)
+            changes.append(("skill", skill))
         
-        self._save_progress()
+        return changes
     
+    @_synchronized
     def update_skill_confidence(self, skill: str, confidence: int):
         """
         Update confidence rating for a skill (1-5 scale).
@@ -335,9 +843,19 @@ class ProgressTracker:
             confidence: Confidence level (1-5)
         """
         if skill in self.progress["skills"]:
-            self.progress["skills"][skill]["confidence"] = max(1, min(5, confidence))
-            self._save_progress()
+            self._record({
+                "type": "skill_confidence_updated",
+                "at": datetime.now().isoformat(),
+                "skill": skill,
+                "confidence": confidence,
+            })
+    
+    def _apply_skill_confidence_updated(self, event: Dict[str, Any]) -> List[tuple]:
+        skill = event["skill"]
+        self.progress["skills"][skill]["confidence"] = max(1, min(5, event["confidence"]))
+        return [("skill", skill)]
     
+    @_synchronized
     def mark_capstone_complete(self, project: str, grade: float, time_spent_minutes: int = 0):
         """
         Mark a capstone project as complete.
@@ -348,27 +866,135 @@ class ProgressTracker:
             time_spent_minutes: Time spent on project
         """
         if project in self.progress["capstones"]:
-            self.progress["capstones"][project]["completed"] = True
-            self.progress["capstones"][project]["grade"] = grade
-            self.progress["capstones"][project]["time_spent_minutes"] = time_spent_minutes
-            
-            # Check for deep learning expert achievement
-            if grade >= 95 and not self.achievements["deep_learning_expert"]["unlocked"]:
-                self.unlock_achievement("deep_learning_expert")
-            
-            # Check for master achievement
-            all_capstones_complete = all(
-                c["completed"] for c in self.progress["capstones"].values()
-            )
-            all_modules_complete = all(
-                m["completed"] for m in self.progress["modules"].values()
-            )
+            self._record({
+                "type": "capstone_completed",
+                "at": datetime.now().isoformat(),
+                "project": project,
+                "grade": grade,
+                "time_spent_minutes": time_spent_minutes,
+            })
+    
+    def _apply_capstone_completed(self, event: Dict[str, Any]) -> List[tuple]:
+        project, grade = event["project"], event["grade"]
+        if not self.progress["capstones"][project]["completed"]:
+            self._counts["capstones_completed"] += 1
+        self.progress["capstones"][project]["completed"] = True
+        self.progress["capstones"][project]["grade"] = grade
+        self.progress["capstones"][project]["time_spent_minutes"] = event["time_spent_minutes"]
+        return [("capstone", project)]
+    
+    @_synchronized
+    def import_history(self, sessions=None, exercises=None, lessons=None) -> Dict[str, int]:
+        """
+        Import a learner's history from another system in one write.
+        
+        Daily activity, streaks, module time, exercises, skills, lessons, XP
+        and level are recomputed from the tables at once (see
+        utils.progress_import, requires pandas) and recorded as a single
+        'history_imported' event; sessions are appended to the log in one go.
+        Exercises and lessons that are already completed are skipped.
+        Achievements are not unlocked retroactively.
+        
+        Args:
+            sessions: DataFrame or list of dicts with 'module', 'start_time'
+                and 'end_time' or 'duration_minutes'
+            exercises: DataFrame or list of dicts with 'module', 'exercise_id',
+                'completed_at' and optionally 'score' and 'skill'
+            lessons: DataFrame or list of dicts with 'module', 'lesson' and
+                optionally 'xp_earned'
             
-            if all_capstones_complete and all_modules_complete:
-                self.unlock_achievement("master")
+        Returns:
+            Number of imported 'sessions', 'days', 'exercises' and 'lessons'
+        """
+        from .progress_import import history_event
+        
+        # Provisional, like start_session's: storage numbers sessions when appending
+        first_id = self.storage.count_sessions() + len(self._pending_sessions) + 1
+        event, session_log = history_event(self.progress, sessions, exercises, lessons, first_id)
+        event["at"] = datetime.now().isoformat()
+        
+        with self.batch():
+            if session_log:
+                self._append_sessions(session_log)
+                self._session_log = None
+                self._sessions_by_start = None
+            self._record(event)
+        
+        return {
+            "sessions": len(session_log),
+            "days": len(event["daily_activity"]),
+            "exercises": len(event["exercises"]),
+            "lessons": len(event["lessons"]),
+        }
+    
+    def _apply_history_imported(self, event: Dict[str, Any]) -> List[tuple]:
+        user_info = self.progress["user_info"]
+        modules = self.progress["modules"]
+        changes = [("user_info",)]
+        
+        for date_str, activity in event["daily_activity"].items():
+            day = self.progress["daily_activity"].setdefault(
+                date_str, {"total_time_minutes": 0, "sessions": 0, "modules_visited": []})
+            day["total_time_minutes"] += activity["total_time_minutes"]
+            day["sessions"] += activity["sessions"]
+            day["modules_visited"] += [m for m in activity["modules_visited"] if m not in day["modules_visited"]]
+            user_info["total_study_time_minutes"] += activity["total_time_minutes"]
+            changes.append(("daily_activity", date_str))
+        
+        for module, minutes in event["module_minutes"].items():
+            if module in modules:
+                modules[module]["time_spent_minutes"] += minutes
+                changes.append(("module", module))
+        
+        # Exercises and lessons completed meanwhile (e.g. when replayed after
+        # a reload) are skipped like repeated completions
+        for exercise in event["exercises"]:
+            module, exercise_id, skill = exercise["module"], exercise["exercise_id"], exercise["skill"]
+            if exercise_id in self._exercise_ids[module]:
+                continue
+            modules[module]["exercises_completed"].append({
+                "id": exercise_id,
+                "completed_at": exercise["completed_at"],
+                "score": exercise["score"],
+                "module": module
+            })
+            self._exercise_ids[module].add(exercise_id)
+            self._counts["exercises_completed"] += 1
+            changes.append(("exercise", module, exercise_id))
             
-            self._save_progress()
+            if skill and skill in self.progress["skills"]:
+                self.progress["skills"][skill]["exercises_completed"] += 1
+                exercise_count = self.progress["skills"][skill]["exercises_completed"]
+                self.progress["skills"][skill]["level"] = min(exercise_count // 10, 10)
+                changes.append(("skill", skill))
+        
+        for lesson in event["lessons"]:
+            module = lesson["module"]
+            if lesson["lesson"] in self._lesson_ids[module]:
+                continue
+            modules[module]["lessons_completed"].append(lesson["lesson"])
+            self._lesson_ids[module].add(lesson["lesson"])
+            self._counts["lessons_completed"] += 1
+            user_info["total_xp"] += lesson["xp_earned"]
+            self._update_module_progress(module)
+            changes.append(("module", module))
+        self._update_level()
+        
+        # Streaks were computed over all study days; a later live study day wins
+        streak = event["streak"]
+        if streak is not None:
+            if user_info["last_study_date"] is None or streak["last_study_date"] >= user_info["last_study_date"]:
+                user_info["last_study_date"] = streak["last_study_date"]
+                user_info["current_streak_days"] = streak["current_streak_days"]
+            user_info["longest_streak_days"] = max(user_info["longest_streak_days"],
+                                                   streak["longest_streak_days"])
+        
+        # Counters of rules and report rollups are rebuilt from the new state
+        self._rules.reset(self.progress)
+        self._rollups = None
+        return changes
     
+    @_synchronized
     def unlock_achievement(self, achievement: str):
         """
         Unlock an achievement.
@@ -376,61 +1002,205 @@ class ProgressTracker:
         Args:
             achievement: Achievement identifier
         """
-        if achievement in self.achievements and not self.achievements[achievement]["unlocked"]:
-            self.achievements[achievement]["unlocked"] = True
-            self.achievements[achievement]["date"] = datetime.now().isoformat()
-            self._save_achievements()
+        self._record({
+            "type": "achievement_unlocked",
+            "at": datetime.now().isoformat(),
+            "achievement": achievement,
+        })
+    
+    def _apply_achievement_unlocked(self, event: Dict[str, Any]) -> List[tuple]:
+        return self._unlock(event["achievement"], event["at"])
+    
+    def _unlock(self, achievement: str, at: str) -> List[tuple]:
+        """Unlock an achievement as part of applying an event."""
+        if achievement not in self.achievements or self.achievements[achievement]["unlocked"]:
+            return []
+        
+        self.achievements[achievement]["unlocked"] = True
+        self.achievements[achievement]["date"] = at
+        if not self._replaying:
             print(f"🏆 Achievement Unlocked: {achievement.replace('_', ' ').title()}")
+        return [("achievement", achievement)]
     
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive learning statistics."""
-        total_lessons = sum(len(m["lessons_completed"]) for m in self.progress["modules"].values())
-        total_exercises = sum(len(m["exercises_completed"]) for m in self.progress["modules"].values())
-        
         return {
             "user": self.progress["user_info"],
             "summary": {
-                "modules_completed": sum(1 for m in self.progress["modules"].values() if m["completed"]),
+                "modules_completed": self._counts["modules_completed"],
                 "total_modules": len(self.progress["modules"]),
-                "lessons_completed": total_lessons,
-                "exercises_completed": total_exercises,
-                "capstones_completed": sum(1 for c in self.progress["capstones"].values() if c["completed"]),
+                "lessons_completed": self._counts["lessons_completed"],
+                "exercises_completed": self._counts["exercises_completed"],
+                "capstones_completed": self._counts["capstones_completed"],
             },
             "skills": self.progress["skills"],
             "achievements": self.achievements,
-            "recent_sessions": self.session_log[-5:] if self.session_log else []
+            "recent_sessions": (self._session_log[-5:] if self._session_log is not None
+                                else self.storage.recent_sessions(5))
         }
     
-    def generate_report(self, period: str = "weekly") -> str:
+    def _activity_rollups(self) -> Dict[str, Any]:
+        """
+        Daily activity prepared for range queries, built on first use.
+        
+        'dates' is sorted; 'minutes' and 'sessions' are prefix sums over it
+        (entry i covers the first i dates), so any date range is two bisects
+        and a subtraction. 'weekly' and 'monthly' hold per-bucket totals.
+        """
+        if self._rollups is None:
+            daily = self.progress["daily_activity"]
+            rollups = {"dates": [], "minutes": [0.0], "sessions": [0], "weekly": {}, "monthly": {}}
+            for date_str in sorted(daily):
+                self._add_to_rollups(rollups, date_str, daily[date_str]["total_time_minutes"],
+                                     daily[date_str]["sessions"])
+            self._rollups = rollups
+        return self._rollups
+    
+    @staticmethod
+    def _add_to_rollups(rollups: Dict[str, Any], date_str: str, minutes: float, sessions: int):
+        """Add activity on the newest (or a new, later) date to the rollups."""
+        dates = rollups["dates"]
+        if not dates or dates[-1] != date_str:
+            dates.append(date_str)
+            rollups["minutes"].append(rollups["minutes"][-1])
+            rollups["sessions"].append(rollups["sessions"][-1])
+        rollups["minutes"][-1] += minutes
+        rollups["sessions"][-1] += sessions
+        
+        year, week, _ = datetime.fromisoformat(date_str).isocalendar()
+        for key, bucket in ((f"{year}-W{week:02d}", "weekly"), (date_str[:7], "monthly")):
+            totals = rollups[bucket].setdefault(key, {"total_time_minutes": 0, "sessions": 0})
+            totals["total_time_minutes"] += minutes
+            totals["sessions"] += sessions
+    
+    def _note_activity(self, date_str: str, minutes: float):
+        """Keep the rollups in sync with one more session on date_str."""
+        if self._rollups is None:
+            return
+        dates = self._rollups["dates"]
+        if not dates or date_str >= dates[-1]:
+            self._add_to_rollups(self._rollups, date_str, minutes, 1)
+        else:
+            # Out-of-order date (clock change, imported history): rebuild lazily
+            self._rollups = None
+    
+    def get_rollup(self, granularity: str = "weekly") -> Dict[str, Dict[str, float]]:
+        """
+        Study time and session counts per day, ISO week or month.
+        
+        Args:
+            granularity: 'daily', 'weekly' (keys like '2024-W07') or 'monthly' ('2024-02')
+            
+        Returns:
+            Dict of bucket -> {'total_time_minutes', 'sessions'}
+        """
+        if granularity == "daily":
+            return {
+                date_str: {"total_time_minutes": day["total_time_minutes"], "sessions": day["sessions"]}
+                for date_str, day in sorted(self.progress["daily_activity"].items())
+            }
+        if granularity not in ("weekly", "monthly"):
+            raise ValueError(f"Unknown granularity: {granularity}")
+        return dict(sorted(self._activity_rollups()[granularity].items()))
+    
+    def _activity_between(self, start_date, end_date) -> tuple:
+        """Total (minutes, sessions) for days start_date..end_date inclusive."""
+        rollups = self._activity_rollups()
+        i = bisect.bisect_left(rollups["dates"], start_date.isoformat())
+        j = bisect.bisect_right(rollups["dates"], end_date.isoformat())
+        return (rollups["minutes"][j] - rollups["minutes"][i],
+                rollups["sessions"][j] - rollups["sessions"][i])
+    
+    def _session_index(self) -> tuple:
+        """
+        Start times (sorted) and sessions in the same order, for the hot
+        (unarchived) log of backends without an index (see _sessions_between).
+        """
+        if self._sessions_by_start is None:
+            hot_sessions = self.iter_sessions(start=self.storage.archived_until())
+            ordered = sorted(hot_sessions, key=lambda s: s["start_time"])
+            self._sessions_by_start = ([s["start_time"] for s in ordered], ordered)
+        return self._sessions_by_start
+    
+    def _sessions_between(self, start_date, end_date) -> List[Dict]:
+        """Sessions that started on days start_date..end_date inclusive."""
+        start, end = start_date.isoformat(), (end_date + timedelta(days=1)).isoformat()
+        
+        if self.storage.indexed_sessions:
+            # An indexed range query beats loading every session into memory
+            sessions = list(self.iter_sessions(start, end))
+            with self._lock:
+                pending = [s for s in self._pending_sessions if start <= s["start_time"] < end]
+            if pending:
+                # Background mode: sessions the writer has not saved yet
+                sessions = sorted(sessions + pending, key=lambda s: s["start_time"])
+            return sessions
+        
+        archived_until = self.storage.archived_until()
+        if archived_until is not None and start < archived_until:
+            # The range reaches into the archive; only overlapping segments are read
+            return list(self.iter_sessions(start, end))
+        
+        starts, sessions = self._session_index()
+        return sessions[bisect.bisect_left(starts, start):bisect.bisect_left(starts, end)]
+    
+    def compact_session_log(self, keep_months: int = 1) -> List[Dict[str, Any]]:
+        """
+        Archive sessions of closed months into compressed monthly segments.
+        
+        Archived sessions stay available through iter_sessions, session_log
+        and reports; they are only read when a query reaches back that far.
+        
+        Args:
+            keep_months: Months kept in the hot log, including the current one
+            
+        Returns:
+            Summaries of the segments written (month, count, total_minutes, modules, ...)
+        """
+        cutoff = datetime.now().date().replace(day=1)
+        for _ in range(keep_months - 1):
+            cutoff = (cutoff - timedelta(days=1)).replace(day=1)
+        
+        segments = self.storage.compact_sessions(cutoff.isoformat())
+        if segments:
+            print(f"✓ Archived {sum(s['count'] for s in segments)} sessions "
+                  f"from {len(segments)} months")
+        return segments
+    
+    def generate_report(self, period: Union[str, int] = "weekly",
+                        start_date: Optional[Union[str, date]] = None,
+                        end_date: Optional[Union[str, date]] = None) -> str:
         """
         Generate a learning report.
         
         Args:
-            period: 'daily', 'weekly', or 'monthly'
+            period: 'daily', 'weekly', 'monthly', 'yearly' or a number of days
+            start_date: First day of a custom range (date or ISO string)
+            end_date: Last day of the range (default: today)
             
         Returns:
             Formatted report string
         """
-        if period == "daily":
-            days = 1
-            title = "Daily Learning Report"
-        elif period == "weekly":
-            days = 7
-            title = "Weekly Learning Report"
-        else:
-            days = 30
-            title = "Monthly Learning Report"
-        
-        end_date = datetime.now().date()
-        start_date = end_date - timedelta(days=days)
+        if isinstance(end_date, str):
+            end_date = date.fromisoformat(end_date)
+        if isinstance(start_date, str):
+            start_date = date.fromisoformat(start_date)
+        end_date = end_date or datetime.now().date()
         
-        # Filter sessions
-        period_sessions = [
-            s for s in self.session_log
-            if datetime.fromisoformat(s["start_time"]).date() >= start_date
-        ]
+        if start_date is not None:
+            title = "Learning Report"
+        elif isinstance(period, int):
+            start_date = end_date - timedelta(days=period)
+            title = f"{period}-Day Learning Report"
+        else:
+            days = REPORT_PERIODS.get(period, REPORT_PERIODS["monthly"])
+            start_date = end_date - timedelta(days=days)
+            title = f"{period.title() if period in REPORT_PERIODS else 'Monthly'} Learning Report"
         
-        total_time = sum(s["duration_minutes"] for s in period_sessions)
+        # Time and session counts come from the daily rollups, completed
+        # lessons from the sessions found through the start time index
+        total_time, session_count = self._activity_between(start_date, end_date)
+        period_sessions = self._sessions_between(start_date, end_date)
         lessons_completed = len(set(
             (s["module"], s["lesson"]) for s in period_sessions if s.get("completed")
         ))
@@ -442,9 +1212,9 @@ Period: {start_date} to {end_date}
 {'='*60}
 
 Study Statistics:
-  - Total Sessions: {len(period_sessions)}
+  - Total Sessions: {session_count}
   - Total Study Time: {total_time:.1f} minutes ({total_time/60:.1f} hours)
-  - Average Session: {total_time/len(period_sessions) if period_sessions else 0:.1f} minutes
+  - Average Session: {total_time/session_count if session_count else 0:.1f} minutes
   - Lessons Completed: {lessons_completed}
 
 Current Streak: {self.progress['user_info']['current_streak_days']} days
@@ -462,11 +1232,34 @@ Module Progress:
             status = "✓" if data["completed"] else f"{data['progress_pct']:.0f}%"
             report += f"  - {module}: {status} ({len(data['lessons_completed'])} lessons)\n"
         
+        if (end_date - start_date).days > 31:
+            # Long custom ranges also get a month by month breakdown
+            report += "\nMonthly Activity:\n"
+            month_start = start_date
+            while month_start <= end_date:
+                next_month = (month_start.replace(day=1) + timedelta(days=32)).replace(day=1)
+                month_end = min(next_month - timedelta(days=1), end_date)
+                minutes, sessions = self._activity_between(month_start, month_end)
+                if sessions:
+                    report += f"  - {month_start:%Y-%m}: {sessions} sessions, {minutes/60:.1f} hours\n"
+                month_start = next_month
+        
         report += "\n" + "="*60
         return report
 
 
+_trackers: Dict[Path, ProgressTracker] = {}
+_trackers_lock = threading.Lock()
+
+
 # Convenience function for quick access
 def get_tracker(base_path: str = ".") -> ProgressTracker:
-    """Get or create a progress tracker instance."""
-    return ProgressTracker(base_path)
\ No newline at end of file
+    """Get or create a progress tracker instance (one per base path)."""
+    key = Path(base_path).resolve()
+    with _trackers_lock:
+        tracker = _trackers.get(key)
+        if tracker is None:
+            tracker = _trackers[key] = ProgressTracker(base_path)
+            return tracker
+    tracker.refresh()
+    return tracker
\ No newline at end of file
@@ -0,0 +1,249 @@
+"""
+Multi-learner progress tracking
+Serve a whole cohort from one process, with state sharded per learner
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Iterator
+from urllib.parse import quote, unquote
+
+from .progress_tracker import ProgressTracker
+
+
+class TrackerService:
+    """
+    Progress tracking for many learners.
+    
+    Every learner gets their own tracker state in
+    ``logs/users/<shard>/<user id>``, where the shard is a short hash prefix
+    so no single directory holds the whole cohort. Trackers for recently
+    used learners stay in an LRU cache; evicted ones are flushed and closed.
+    Trackers held through ``use()`` are never evicted, so hold them that way
+    when they are used across other service calls or from several threads.
+    Bulk operations group records per learner and write each learner once.
+    
+    Example:
+        service = TrackerService(".")
+        service.record_exercises([
+            {"user_id": "alice", "module": "module_1", "exercise_id": "ex_1_1", "score": 0.9},
+            {"user_id": "bob", "module": "module_1", "exercise_id": "ex_1_1", "score": 1.0},
+        ])
+        with service.use("alice") as tracker:
+            print(tracker.get_stats()["summary"])
+    """
+    
+    def __init__(self, base_path: str = ".", storage: str = "json",
+                 max_cached: int = 256,
+                 shard_chars: int = 2,
+                 **tracker_kwargs):
+        """
+        Initialize service.
+        
+        Args:
+            base_path: Base directory for the learning platform
+            storage: Storage backend for every learner ('json' or 'sqlite')
+            max_cached: Number of learner trackers kept in memory
+            shard_chars: Hex characters of the user id hash used as shard directory
+            **tracker_kwargs: Passed on to ProgressTracker (e.g. autosave_delay)
+        """
+        self.base_path = Path(base_path)
+        self.users_dir = self.base_path / "logs" / "users"
+        self.storage = storage
+        self.max_cached = max_cached
+        self.shard_chars = shard_chars
+        self.tracker_kwargs = tracker_kwargs
+        
+        self._trackers: "OrderedDict[str, ProgressTracker]" = OrderedDict()
+        # Number of use() blocks holding each learner's tracker
+        self._holders: Dict[str, int] = {}
+        self._lock = threading.RLock()
+    
+    def user_dir(self, user_id: str) -> Path:
+        """Directory holding one learner's state."""
+        if not user_id:
+            raise ValueError("User id must not be empty")
+        shard = hashlib.sha256(user_id.encode('utf-8')).hexdigest()[:self.shard_chars]
+        # Quoting keeps ids readable and reversible while making them safe file names
+        name = quote(user_id, safe="")
+        if name.startswith("."):
+            # quote() leaves dots alone: '.' and '..' would be the shard or users directory
+            name = "%2E" + name[1:]
+        return self.users_dir / shard / name
+    
+    def iter_user_ids(self) -> Iterator[str]:
+        """Yield the id of every learner with saved state."""
+        if not self.users_dir.exists():
+            return
+        for shard in sorted(os.scandir(self.users_dir), key=lambda e: e.name):
+            if not shard.is_dir():
+                continue
+            for entry in sorted(os.scandir(shard.path), key=lambda e: e.name):
+                if entry.is_dir():
+                    yield unquote(entry.name)
+    
+    def get(self, user_id: str) -> ProgressTracker:
+        """
+        Get the tracker for a learner, creating their state on first use.
+        
+        The tracker is not held: once other learners are loaded it may be
+        evicted and closed. Use it right away, or hold it with ``use()``
+        to keep it across other service calls or share it between threads.
+        
+        Args:
+            user_id: Learner identifier
+            
+        Returns:
+            ProgressTracker for that learner
+        """
+        with self._lock:
+            tracker = self._tracker(user_id)
+            self._evict()
+            return tracker
+    
+    @contextmanager
+    def use(self, user_id: str) -> Iterator[ProgressTracker]:
+        """
+        Hold a learner's tracker so it is not evicted while in use.
+        
+        Example:
+            with service.use("alice") as tracker:
+                tracker.start_session("module_1", "project_1_1")
+                
+        Args:
+            user_id: Learner identifier
+            
+        Yields:
+            ProgressTracker for that learner
+        """
+        with self._lock:
+            tracker = self._tracker(user_id)
+            self._holders[user_id] = self._holders.get(user_id, 0) + 1
+            self._evict()
+        try:
+            yield tracker
+        finally:
+            with self._lock:
+                # close() may have released every tracker in the meantime
+                holders = self._holders.pop(user_id, 0) - 1
+                if holders > 0:
+                    self._holders[user_id] = holders
+                self._evict()
+    
+    def _tracker(self, user_id: str) -> ProgressTracker:
+        """Cached tracker of a learner, marked as most recently used."""
+        tracker = self._trackers.get(user_id)
+        if tracker is not None:
+            self._trackers.move_to_end(user_id)
+            return tracker
+        
+        tracker = ProgressTracker(self.base_path, self.storage,
+                                  logs_dir=self.user_dir(user_id),
+                                  **self.tracker_kwargs)
+        self._trackers[user_id] = tracker
+        return tracker
+    
+    def _evict(self):
+        """Close least recently used trackers beyond max_cached that nobody holds."""
+        excess = len(self._trackers) - self.max_cached
+        if excess <= 0:
+            return
+        
+        for user_id in list(self._trackers):
+            if excess <= 0:
+                break
+            tracker = self._trackers[user_id]
+            if user_id in self._holders or tracker.current_session is not None:
+                # Held trackers are still being written to; learners with an
+                # open session would fail to end it
+                continue
+            tracker.close()
+            del self._trackers[user_id]
+            excess -= 1
+    
+    def _group(self, records: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            grouped.setdefault(record["user_id"], []).append(record)
+        return grouped
+    
+    def record_exercises(self, records: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Mark many exercises complete for many learners.
+        
+        Args:
+            records: Dicts with 'user_id', 'module', 'exercise_id' and
+                optionally 'score' (default 1.0) and 'skill'
+                
+        Returns:
+            Dict of user id -> number of records processed
+        """
+        counts = {}
+        for user_id, user_records in self._group(records).items():
+            with self.use(user_id) as tracker, tracker.batch():
+                for record in user_records:
+                    tracker.mark_exercise_complete(record["module"], record["exercise_id"],
+                                                   record.get("score", 1.0), record.get("skill"))
+            counts[user_id] = len(user_records)
+        return counts
+    
+    def record_lessons(self, records: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Mark many lessons complete for many learners.
+        
+        Args:
+            records: Dicts with 'user_id', 'module', 'lesson' and optionally 'xp_earned'
+            
+        Returns:
+            Dict of user id -> number of records processed
+        """
+        counts = {}
+        for user_id, user_records in self._group(records).items():
+            with self.use(user_id) as tracker, tracker.batch():
+                for record in user_records:
+                    tracker.mark_lesson_complete(record["module"], record["lesson"],
+                                                 record.get("xp_earned", 0))
+            counts[user_id] = len(user_records)
+        return counts
+    
+    def get_stats(self, user_ids: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Summary statistics for several learners.
+        
+        Args:
+            user_ids: Learners to include (default: every learner with saved state)
+            
+        Returns:
+            Dict of user id -> the 'summary' part of ProgressTracker.get_stats()
+        """
+        if user_ids is None:
+            user_ids = self.iter_user_ids()
+        stats = {}
+        for user_id in user_ids:
+            with self.use(user_id) as tracker:
+                stats[user_id] = tracker.get_stats()["summary"]
+        return stats
+    
+    def flush(self):
+        """Save pending changes of every cached learner."""
+        with self._lock:
+            for tracker in self._trackers.values():
+                tracker.flush()
+    
+    def close(self):
+        """Flush and release every cached learner (trackers held by use() included)."""
+        with self._lock:
+            for tracker in self._trackers.values():
+                tracker.close()
+            self._trackers.clear()
+            self._holders.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -3,6 +3,7 @@ Visualization utilities for ML Learning Platform
 Publication-quality plots and interactive visualizations
 """
 
+import functools
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib
@@ -10,23 +11,48 @@ from matplotlib.patches import FancyBboxPatch
 import seaborn as sns
 from typing import Optional, List, Tuple, Any
 
-# Set academic style
-plt.style.use('seaborn-v0_8-whitegrid')
-matplotlib.rcParams['font.size'] = 11
-matplotlib.rcParams['axes.labelsize'] = 12
-matplotlib.rcParams['axes.titlesize'] = 14
-matplotlib.rcParams['xtick.labelsize'] = 10
-matplotlib.rcParams['ytick.labelsize'] = 10
-matplotlib.rcParams['legend.fontsize'] = 10
-matplotlib.rcParams['figure.titlesize'] = 16
+_style_applied = False
 
 
+def apply_style():
+    """
+    Set the academic plot style (global matplotlib state).
+    
+    Runs automatically before the first plot made by this module, so
+    importing it leaves matplotlib untouched; call it directly to style
+    figures created elsewhere.
+    """
+    global _style_applied
+    if _style_applied:
+        return
+    plt.style.use('seaborn-v0_8-whitegrid')
+    matplotlib.rcParams['font.size'] = 11
+    matplotlib.rcParams['axes.labelsize'] = 12
+    matplotlib.rcParams['axes.titlesize'] = 14
+    matplotlib.rcParams['xtick.labelsize'] = 10
+    matplotlib.rcParams['ytick.labelsize'] = 10
+    matplotlib.rcParams['legend.fontsize'] = 10
+    matplotlib.rcParams['figure.titlesize'] = 16
+    _style_applied = True
+
+
+def _styled(func):
+    """Apply the academic style before the first plot."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        apply_style()
+        return func(*args, **kwargs)
+    return wrapper
+
+
+@_styled
 def setup_figure(figsize: Tuple[int, int] = (10, 6), dpi: int = 100):
     """Create a figure with academic styling."""
     fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
     return fig, ax
 
 
+@_styled
 def plot_vector_2d(vector: np.ndarray, 
                    origin: Tuple[float, float] = (0, 0),
                    label: Optional[str] = None,
@@ -61,6 +87,7 @@ def plot_vector_2d(vector: np.ndarray,
     return ax
 
 
+@_styled
 def plot_matrix_heatmap(matrix: np.ndarray, 
                         title: str = "Matrix Visualization",
                         cmap: str = 'RdBu_r',
@@ -96,6 +123,7 @@ def plot_matrix_heatmap(matrix: np.ndarray,
     return ax
 
 
+@_styled
 def plot_function_1d(func, 
                      x_range: Tuple[float, float] = (-10, 10),
                      n_points: int = 1000,
@@ -133,6 +161,7 @@ def plot_function_1d(func,
     return ax
 
 
+@_styled
 def plot_gradient_descent_path(func, 
                                path: List[np.ndarray],
                                x_range: Tuple[float, float] = (-10, 10),
@@ -180,6 +209,7 @@ def plot_gradient_descent_path(func,
     return ax
 
 
+@_styled
 def plot_distribution(data: np.ndarray,
                       dist_type: str = 'hist',
                       title: str = "Distribution",
@@ -224,6 +254,7 @@ def plot_distribution(data: np.ndarray,
     return ax
 
 
+@_styled
 def plot_confusion_matrix(cm: np.ndarray,
                         classes: List[str],
                         title: str = "Confusion Matrix",
@@ -267,6 +298,7 @@ def plot_confusion_matrix(cm: np.ndarray,
     return ax
 
 
+@_styled
 def plot_learning_curve(train_scores: List[float],
                        val_scores: List[float],
                        title: str = "Learning Curve",
@@ -305,6 +337,7 @@ def plot_learning_curve(train_scores: List[float],
     return ax
 
 
+@_styled
 def plot_decision_boundary(X: np.ndarray,
                           y: np.ndarray,
                           model,
@@ -349,6 +382,7 @@ def plot_decision_boundary(X: np.ndarray,
     return ax
 
 
+@_styled
 def create_progress_dashboard(stats: dict):
     """
     Create a visual dashboard of learning progress.
@@ -477,6 +511,7 @@ def create_progress_dashboard(stats: dict):
 
 
 # Convenience function for quick plots
+@_styled
 def quick_plot(x, y, title="Quick Plot", xlabel="X", ylabel="Y"):
     """Create a quick line plot."""
     fig, ax = setup_figure()